@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""Performance benchmarks for the core simulator, canvas painting and statistics updates"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+# Benchmarks render offscreen unless a platform is explicitly requested
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.core.monte_carlo import MonteCarloSimulator
+
+
+BENCHMARKS = {}
+
+
+def benchmark(name, repeats=7, group="core"):
+    def register(func):
+        BENCHMARKS[name] = (func, repeats, group)
+        return func
+    return register
+
+
+def measure(setup, repeats: int, min_time: float = 0.02) -> dict:
+    # setup() prepares state once and returns the callable to time, so setup
+    # cost never lands in the measurement. Fast calls are looped until one
+    # repeat takes at least min_time, like timeit's autorange.
+    run = setup()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        if time.perf_counter() - start >= min_time or number >= 1 << 20:
+            break
+        number *= 10
+
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        times.append((time.perf_counter() - start) / number)
+    return {
+        "median": statistics.median(times),
+        "min": min(times),
+        "repeats": repeats,
+        "number": number,
+    }
+
+
+# Core generation
+
+for batch_size in (100, 10_000, 1_000_000):
+    def generate(batch_size=batch_size):
+        simulator = MonteCarloSimulator(seed=0)
+        return lambda: simulator.generate_batch_points(batch_size)
+    benchmark(f"core.generate_batch_points[{batch_size}]")(generate)
+
+    def add_points(batch_size=batch_size):
+        simulator = MonteCarloSimulator(seed=0)
+        return lambda: simulator.add_points(batch_size)
+    benchmark(f"core.add_points[{batch_size}]")(add_points)
+
+    def add_points_streaming(batch_size=batch_size):
+        simulator = MonteCarloSimulator(store_points=False, seed=0)
+        return lambda: simulator.add_points(batch_size)
+    benchmark(f"core.add_points_streaming[{batch_size}]")(add_points_streaming)
+
+
+@benchmark("core.get_statistics[100000 batches]", group="core")
+def get_statistics():
+    simulator = MonteCarloSimulator(seed=0)
+    for _ in range(100_000):
+        simulator.add_points(1)
+    return simulator.get_statistics
+
+
+# Qt benchmarks; the application is created on first use
+
+_app = None
+
+
+def qt_app():
+    global _app
+    if _app is None:
+        from PySide6.QtWidgets import QApplication
+        _app = QApplication.instance() or QApplication(sys.argv)
+    return _app
+
+
+for point_count in (1_000, 10_000, 100_000):
+    def paint(point_count=point_count):
+        qt_app()
+        from PySide6.QtGui import QImage
+        from src.ui.widgets.simulation_canvas import SimulationCanvas
+
+        canvas = SimulationCanvas()
+        canvas.set_animation_enabled(False)
+        canvas.resize(800, 800)
+        canvas.add_points(MonteCarloSimulator(seed=0).generate_batch_points(point_count))
+        image = QImage(canvas.size(), QImage.Format_ARGB32_Premultiplied)
+        return lambda: canvas.render(image)
+    benchmark(f"canvas.paintEvent[{point_count}]", repeats=5, group="canvas")(paint)
+
+    def draw_points(point_count=point_count):
+        # Rasterising a batch of settled points, what the accumulation layer
+        # pays when points arrive or the layer is rebuilt
+        qt_app()
+        from PySide6.QtGui import QImage, QPainter
+        from src.ui.widgets.simulation_canvas import SimulationCanvas
+
+        canvas = SimulationCanvas()
+        canvas.resize(800, 800)
+        batch = MonteCarloSimulator(seed=0).generate_batch_points(point_count)
+        image = QImage(canvas.size(), QImage.Format_ARGB32_Premultiplied)
+
+        def run():
+            painter = QPainter(image)
+            painter.setRenderHint(QPainter.Antialiasing, True)
+            canvas.draw_points(painter, batch)
+            painter.end()
+        return run
+    benchmark(f"canvas.draw_points[{point_count}]", repeats=5, group="canvas")(draw_points)
+
+
+for history_length in (1_000, 100_000):
+    def update_statistics(history_length=history_length):
+        qt_app()
+        from src.ui.widgets.statistics_panel import StatisticsPanel
+
+        simulator = MonteCarloSimulator(seed=0)
+        for _ in range(history_length - 1):
+            simulator.add_points(10)
+        result = simulator.add_points(10)
+        panel = StatisticsPanel()
+        panel.resize(500, 800)
+        # Shown, unthrottled: every call redraws the visible (convergence) tab
+        panel.show()
+        panel.set_refresh_rate(1e9)
+        return lambda: panel.update_statistics(result, simulator)
+    benchmark(f"statistics.update_statistics[{history_length} batches]", repeats=5,
+              group="statistics")(update_statistics)
+
+    def update_convergence_plots(history_length=history_length):
+        # Should stay flat as the run grows: plots get a decimated series
+        qt_app()
+        from src.ui.widgets.statistics_panel import StatisticsPanel
+
+        simulator = MonteCarloSimulator(seed=0)
+        for _ in range(history_length):
+            simulator.add_points(10)
+        panel = StatisticsPanel()
+        panel.resize(500, 800)
+        return lambda: panel.update_convergence_plots(simulator)
+    benchmark(f"statistics.update_convergence_plots[{history_length} batches]", repeats=5,
+              group="statistics")(update_convergence_plots)
+
+
+def environment() -> dict:
+    info = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+    try:
+        import PySide6
+        info["pyside6"] = PySide6.__version__
+    except ImportError:
+        pass
+    return info
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        ratio = current["median"] / previous["median"] if previous["median"] > 0 else float("inf")
+        status = "REGRESSION" if ratio > 1.0 + threshold else "ok"
+        print(f"  {name:<48} {previous['median'] * 1000:>10.3f} ms -> "
+              f"{current['median'] * 1000:>10.3f} ms  x{ratio:.2f}  {status}")
+        if status != "ok":
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filter", default="",
+                        help="only run benchmarks whose name contains this text (e.g. core, canvas)")
+    parser.add_argument("--output", metavar="PATH", help="write results to this JSON file")
+    parser.add_argument("--baseline", metavar="PATH", default=os.path.join(os.path.dirname(__file__), "baseline.json"),
+                        help="baseline JSON to compare against (default: benchmarks/baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative slowdown that counts as a regression (default: 0.25)")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    selected = {name: spec for name, spec in BENCHMARKS.items() if args.filter in name}
+    if args.list:
+        print("\n".join(selected))
+        return 0
+
+    results = {}
+    for name, (func, repeats, group) in selected.items():
+        results[name] = dict(measure(func, repeats), group=group)
+        print(f"  {name:<48} {results[name]['median'] * 1000:>10.3f} ms (min {results[name]['min'] * 1000:.3f} ms)")
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"Comparing against {args.baseline}:")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            return 1
+        print("No regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
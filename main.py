@@ -3,23 +3,14 @@
 
 import sys
 import os
-from PySide6.QtWidgets import QApplication, QMessageBox
-from PySide6.QtCore import QDir
-from PySide6.QtGui import QIcon
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-try:
-    from src.ui.main_window import MainWindow
-    from src.utils.colors import Colors
-except ImportError as e:
-    print(f"Import error: {e}")
-    print("Make sure all required libraries are installed:")
-    print("pip install PySide6 numpy matplotlib pyqtgraph")
-    sys.exit(1)
-
 
 def setup_application():
+    from PySide6.QtWidgets import QApplication
+    from src.utils.colors import Colors
+    
     app = QApplication(sys.argv)
     app.setApplicationName("Monte Carlo π Visualization")
     app.setApplicationVersion("1.0")
@@ -49,7 +40,17 @@ def setup_application():
     return app
 
 
-def main():
+def run_gui():
+    # Qt is only imported here so the headless path never loads it
+    try:
+        from PySide6.QtWidgets import QMessageBox
+        from src.ui.main_window import MainWindow
+    except ImportError as e:
+        print(f"Import error: {e}")
+        print("Make sure all required libraries are installed:")
+        print("pip install PySide6 numpy matplotlib pyqtgraph")
+        return 1
+    
     try:
         app = setup_application()
         window = MainWindow()
@@ -70,6 +71,21 @@ def main():
         return 1
 
 
+def main():
+    args = sys.argv[1:]
+    if '--headless' in args:
+        try:
+            from src.headless import main as run_headless
+        except ImportError as e:
+            print(f"Import error: {e}")
+            print("Headless mode only needs numpy: pip install numpy")
+            return 1
+        args.remove('--headless')
+        return run_headless(args)
+    
+    return run_gui()
+
+
 if __name__ == "__main__":
     exit_code = main()
     sys.exit(exit_code)
\ No newline at end of file
@@ -0,0 +1,180 @@
+import numpy as np
+from pathlib import Path
+from typing import List, Union
+import json
+import os
+import shutil
+
+from .monte_carlo import MonteCarloSimulator, SimulatorSnapshot
+from .parallel import ParallelMonteCarloSimulator
+from .point_store import PointBatch
+
+
+# A checkpoint is a directory: state.json for counts, settings and RNG
+# state, plus a data-N subdirectory with one .npy file per history and per
+# point column. Point columns are opened memory-mapped on load, so resuming
+# a large run is lazy. Every save writes a new data-N and then swaps
+# state.json, so the files a resumed run still maps are never overwritten.
+# Only files an earlier save wrote are removed afterwards; anything else in
+# the directory is left alone.
+CHECKPOINT_VERSION = 1
+STATE_FILE = 'state.json'
+DATA_PREFIX = 'data-'
+POINT_COLUMNS = (('x', np.float64), ('y', np.float64), ('inside', bool))
+COPY_CHUNK_SIZE = 1 << 22
+
+ENGINES = {
+    MonteCarloSimulator.engine: MonteCarloSimulator,
+    ParallelMonteCarloSimulator.engine: ParallelMonteCarloSimulator,
+}
+
+
+def _to_json(value):
+    if isinstance(value, dict):
+        return {key: _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    return value
+
+
+def _write_column(path: Path, snapshot: SimulatorSnapshot, column: str, dtype, count: int):
+    if count == 0:
+        np.save(path, np.empty(0, dtype=dtype))
+        return
+    # Copy segment by segment so saving never materialises the whole run
+    output = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(count,))
+    offset = 0
+    for segment in snapshot.point_segments:
+        values = getattr(segment, column)
+        for start in range(0, len(values), COPY_CHUNK_SIZE):
+            chunk = values[start:start + COPY_CHUNK_SIZE]
+            output[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+    output.flush()
+    del output
+
+
+def _owned_files(path: Path, state: dict) -> List[str]:
+    # Names in the checkpoint directory that the save described by state
+    # wrote: its data-N directory, or the flat files of older saves, plus
+    # anything earlier saves could not remove yet
+    if 'data' in state:
+        names = [state['data']]
+    else:
+        names = [f'points_{column}.npy' for column, _ in POINT_COLUMNS]
+        names += [f'{name}.npy' for name in state.get('histories', [])]
+    names += state.get('stale', [])
+    return [name for name in names if (path / name).exists()]
+
+
+def _remove_files(path: Path, names: List[str]):
+    # Files still memory-mapped cannot be removed on Windows; they stay
+    # listed as stale in state.json for a later save to retry
+    for name in names:
+        entry = path / name
+        if entry.is_dir():
+            shutil.rmtree(entry, ignore_errors=True)
+        else:
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+
+
+def check_checkpoint_path(path: Union[str, Path]):
+    # Saves replace their own files only, so they go to a new or empty
+    # directory or over an earlier checkpoint
+    path = Path(path)
+    if path.exists() and not (path / STATE_FILE).exists() and (not path.is_dir() or any(path.iterdir())):
+        raise ValueError(f"{path} is not empty and not a checkpoint; choose a new or empty directory")
+
+
+def save_checkpoint(source: Union[MonteCarloSimulator, SimulatorSnapshot], path: Union[str, Path]) -> Path:
+    snapshot = source.snapshot() if isinstance(source, MonteCarloSimulator) else source
+    path = Path(path)
+    check_checkpoint_path(path)
+    previous_state = {}
+    if (path / STATE_FILE).exists():
+        with open(path / STATE_FILE) as f:
+            previous_state = json.load(f)
+    path.mkdir(parents=True, exist_ok=True)
+
+    stale = _owned_files(path, previous_state) if previous_state else []
+    generation = 0
+    if 'data' in previous_state:
+        generation = int(previous_state['data'][len(DATA_PREFIX):]) + 1
+    while (path / f'{DATA_PREFIX}{generation}').exists():
+        # Left behind by an interrupted save
+        generation += 1
+    data_name = f'{DATA_PREFIX}{generation}'
+    data_path = path / data_name
+    data_path.mkdir()
+
+    point_count = sum(len(segment) for segment in snapshot.point_segments)
+    for column, dtype in POINT_COLUMNS:
+        _write_column(data_path / f'points_{column}.npy', snapshot, column, dtype, point_count)
+
+    for name, values in snapshot.histories.items():
+        np.save(data_path / f'{name}.npy', values)
+
+    state = {
+        'version': CHECKPOINT_VERSION,
+        'engine': snapshot.engine,
+        'settings': snapshot.settings,
+        'points_inside': snapshot.points_inside,
+        'total_points': snapshot.total_points,
+        'stored_points': point_count,
+        'histories': list(snapshot.histories),
+        'rng_state': snapshot.rng_state,
+        'distance_counts': snapshot.distance_counts,
+        'data': data_name,
+        'stale': stale,
+    }
+    # Replacing state.json is atomic, so an interrupted save leaves the last
+    # good checkpoint in place
+    temp_state = path / (STATE_FILE + '.tmp')
+    with open(temp_state, 'w') as f:
+        json.dump(_to_json(state), f, indent=2)
+    os.replace(temp_state, path / STATE_FILE)
+
+    _remove_files(path, stale)
+    return path
+
+
+def load_checkpoint(path: Union[str, Path], mmap: bool = True) -> MonteCarloSimulator:
+    path = Path(path)
+    with open(path / STATE_FILE) as f:
+        state = json.load(f)
+
+    if state.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version: {state.get('version')}")
+    if state['engine'] not in ENGINES:
+        raise ValueError(f"Unknown simulation engine: {state['engine']}")
+
+    # Checkpoints from before data-N directories keep their files at the top
+    data_path = path / state.get('data', '')
+    mmap_mode = 'r' if mmap and state['stored_points'] > 0 else None
+    columns = {column: np.load(data_path / f'points_{column}.npy', mmap_mode=mmap_mode)
+               for column, _ in POINT_COLUMNS}
+
+    snapshot = SimulatorSnapshot(
+        engine=state['engine'],
+        settings=state['settings'],
+        points_inside=state['points_inside'],
+        total_points=state['total_points'],
+        histories={name: np.load(data_path / f'{name}.npy') for name in state['histories']},
+        rng_state=state['rng_state'],
+        point_segments=[PointBatch(columns['x'], columns['y'], columns['inside'])],
+        distance_counts=(np.array(state['distance_counts'], dtype=np.int64)
+                         if state.get('distance_counts') is not None else None)
+    )
+
+    simulator = ENGINES[state['engine']](**state['settings'])
+    simulator.restore(snapshot)
+    return simulator
@@ -0,0 +1,76 @@
+import numpy as np
+
+from .point_store import PointBatch
+
+
+class DensityGrid:
+    # Fixed-resolution inside/outside histogram over [-1,1] x [-1,1]. Row 0 is
+    # the top of the square (y = 1) so the counts map directly onto an image.
+    # Memory is 2 * resolution² counters regardless of how many points are added.
+    def __init__(self, resolution: int = 512):
+        self.resolution = resolution
+        self.inside = np.zeros((resolution, resolution), dtype=np.int64)
+        self.outside = np.zeros((resolution, resolution), dtype=np.int64)
+        self.total = 0
+        self.points_inside = 0
+
+    def clear(self):
+        self.inside.fill(0)
+        self.outside.fill(0)
+        self.total = 0
+        self.points_inside = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.inside.nbytes + self.outside.nbytes
+
+    def add(self, batch: PointBatch):
+        if len(batch) == 0:
+            return
+        resolution = self.resolution
+        column = np.clip(((batch.x + 1.0) * (resolution / 2)).astype(np.intp), 0, resolution - 1)
+        row = np.clip(((1.0 - batch.y) * (resolution / 2)).astype(np.intp), 0, resolution - 1)
+        index = row * resolution + column
+
+        cells = resolution * resolution
+        if len(batch) < cells // 8:
+            # Small batches: scatter-add instead of allocating full-size bincounts
+            np.add.at(self.inside.ravel(), index[batch.inside], 1)
+            np.add.at(self.outside.ravel(), index[~batch.inside], 1)
+        else:
+            self.inside += np.bincount(index[batch.inside], minlength=cells).reshape(resolution, resolution)
+            self.outside += np.bincount(index[~batch.inside], minlength=cells).reshape(resolution, resolution)
+        self.total += len(batch)
+        self.points_inside += int(np.count_nonzero(batch.inside))
+
+    def merge(self, other: 'DensityGrid'):
+        if other.resolution != self.resolution:
+            raise ValueError(f"Cannot merge a {other.resolution}² grid into a {self.resolution}² grid")
+        self.inside += other.inside
+        self.outside += other.outside
+        self.total += other.total
+        self.points_inside += other.points_inside
+
+    def to_rgba(self, inside_color, outside_color, background) -> np.ndarray:
+        # Log-scaled intensity per cell, coloured by its inside share and
+        # blended over the background. Returns a (resolution, resolution, 4)
+        # uint8 array.
+        counts = self.inside + self.outside
+        peak = counts.max()
+        intensity = np.log1p(counts, dtype=np.float32)
+        if peak > 0:
+            intensity *= np.float32(1.0 / np.log1p(peak))
+        share = np.divide(self.inside, np.maximum(counts, 1), dtype=np.float32)
+
+        rgba = np.empty((self.resolution, self.resolution, 4), dtype=np.uint8)
+        for channel in range(3):
+            base = np.float32(background[channel])
+            low = np.float32(outside_color[channel] - background[channel])
+            span = np.float32(inside_color[channel] - outside_color[channel])
+            value = share * span
+            value += low
+            value *= intensity
+            value += base
+            rgba[..., channel] = value
+        rgba[..., 3] = 255
+        return rgba
@@ -0,0 +1,189 @@
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+class MinMaxLevel:
+    # One pyramid level: every block of block_size consecutive values is
+    # summarised by its minimum and maximum and the indices they occur at
+    def __init__(self, block_size: int):
+        self.block_size = block_size
+        self.count = 0
+        self.min = np.empty(16, dtype=np.float64)
+        self.max = np.empty(16, dtype=np.float64)
+        self.min_index = np.empty(16, dtype=np.int64)
+        self.max_index = np.empty(16, dtype=np.int64)
+
+    def reserve(self, required: int):
+        if required <= len(self.min):
+            return
+        capacity = len(self.min)
+        while capacity < required:
+            capacity *= 2
+        for name in ('min', 'max', 'min_index', 'max_index'):
+            buffer = getattr(self, name)
+            grown = np.empty(capacity, dtype=buffer.dtype)
+            grown[:self.count] = buffer[:self.count]
+            setattr(self, name, grown)
+
+    def arrays(self, start: int, end: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        return (self.min[start:end], self.min_index[start:end],
+                self.max[start:end], self.max_index[start:end])
+
+
+def reduce_blocks(mins: np.ndarray, min_index: np.ndarray, maxs: np.ndarray, max_index: np.ndarray,
+                  factor: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # Combines every `factor` consecutive entries; a short last group is padded
+    count = -(-len(mins) // factor)
+    padding = count * factor - len(mins)
+    mins = np.concatenate([mins, np.full(padding, np.inf)]).reshape(count, factor)
+    maxs = np.concatenate([maxs, np.full(padding, -np.inf)]).reshape(count, factor)
+    min_index = np.concatenate([min_index, np.zeros(padding, dtype=np.int64)]).reshape(count, factor)
+    max_index = np.concatenate([max_index, np.zeros(padding, dtype=np.int64)]).reshape(count, factor)
+    rows = np.arange(count)
+    low = np.argmin(mins, axis=1)
+    high = np.argmax(maxs, axis=1)
+    return mins[rows, low], min_index[rows, low], maxs[rows, high], max_index[rows, high]
+
+
+class History:
+    # Per-batch series on a preallocated buffer with amortised doubling.
+    # With decimate=True it also maintains a min/max pyramid: level k
+    # summarises blocks of factor**k values, updated in O(levels) per append,
+    # so decimate() can return a bounded, shape-preserving series for any
+    # range at a cost that does not grow with the length of the run.
+    def __init__(self, decimate: bool = True, factor: int = 4, initial_capacity: int = 1024):
+        self.decimate_enabled = decimate
+        self.factor = max(2, factor)
+        self.initial_capacity = max(1, initial_capacity)
+        self.clear()
+
+    def clear(self):
+        self._values = np.empty(self.initial_capacity, dtype=np.float64)
+        self.size = 0
+        self.levels: List[MinMaxLevel] = []
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.values, dtype=dtype)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values[:self.size]
+
+    @property
+    def nbytes(self) -> int:
+        return self._values.nbytes + sum(level.min.nbytes * 4 for level in self.levels)
+
+    def _reserve(self, required: int):
+        if required <= len(self._values):
+            return
+        capacity = len(self._values)
+        while capacity < required:
+            capacity *= 2
+        grown = np.empty(capacity, dtype=np.float64)
+        grown[:self.size] = self._values[:self.size]
+        self._values = grown
+
+    def append(self, value: float):
+        index = self.size
+        self._reserve(index + 1)
+        self._values[index] = value
+        self.size = index + 1
+        if not self.decimate_enabled:
+            return
+
+        # A value that is no new extreme of its block cannot be one of the
+        # enclosing coarser block either, so most appends stop early
+        for level in self.levels:
+            block = index // level.block_size
+            if block == level.count:
+                level.reserve(block + 1)
+                level.min[block] = level.max[block] = value
+                level.min_index[block] = level.max_index[block] = index
+                level.count = block + 1
+            elif value < level.min[block]:
+                level.min[block] = value
+                level.min_index[block] = index
+            elif value > level.max[block]:
+                level.max[block] = value
+                level.max_index[block] = index
+            else:
+                break
+        self._add_levels()
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return
+        start = self.size
+        self._reserve(start + len(values))
+        self._values[start:start + len(values)] = values
+        self.size = start + len(values)
+        if not self.decimate_enabled:
+            return
+
+        # Rebuild the blocks touched by the new values, finest level first
+        for number, level in enumerate(self.levels):
+            first = start // level.block_size
+            self._rebuild(number, first)
+        self._add_levels()
+
+    def _children(self, number: int, first: int):
+        # Entries under level `number` from child `first` on: raw values for
+        # the finest level, the next finer level otherwise
+        if number == 0:
+            values = self._values[first:self.size]
+            index = np.arange(first, self.size, dtype=np.int64)
+            return values, index, values, index
+        child = self.levels[number - 1]
+        return child.arrays(first, child.count)
+
+    def _rebuild(self, number: int, first: int):
+        level = self.levels[number]
+        mins, min_index, maxs, max_index = reduce_blocks(*self._children(number, first * self.factor),
+                                                         self.factor)
+        end = first + len(mins)
+        level.reserve(end)
+        level.min[first:end] = mins
+        level.min_index[first:end] = min_index
+        level.max[first:end] = maxs
+        level.max_index[first:end] = max_index
+        level.count = end
+
+    def _add_levels(self):
+        # A level is kept while it has more than one block
+        while self.factor ** (len(self.levels) + 1) < self.size:
+            self.levels.append(MinMaxLevel(self.factor ** (len(self.levels) + 1)))
+            self._rebuild(len(self.levels) - 1, 0)
+
+    def decimate(self, max_points: int, start: int = 0,
+                 end: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        # (indices, values) of at most about max_points samples over
+        # [start, end): the raw values if they fit, otherwise the minimum and
+        # maximum of each block, in order, at the finest level that fits
+        size = self.size
+        end = size if end is None else min(end, size)
+        start = min(max(0, start), end)
+        if end - start <= max_points or not self.levels:
+            return np.arange(start, end, dtype=np.int64), self._values[start:end].copy()
+
+        blocks = max(1, max_points // 2)
+        for level in self.levels:
+            first, last = start // level.block_size, (end - 1) // level.block_size + 1
+            if last - first <= blocks:
+                break
+        mins, min_index, maxs, max_index = level.arrays(first, min(last, level.count))
+
+        min_first = min_index <= max_index
+        indices = np.empty(2 * len(mins), dtype=np.int64)
+        values = np.empty(2 * len(mins), dtype=np.float64)
+        indices[0::2] = np.where(min_first, min_index, max_index)
+        indices[1::2] = np.where(min_first, max_index, min_index)
+        values[0::2] = np.where(min_first, mins, maxs)
+        values[1::2] = np.where(min_first, maxs, mins)
+        return indices, values
@@ -1,71 +1,367 @@
 import numpy as np
-from typing import Tuple, List, Optional
+from typing import Tuple, List, Optional, Dict
 from dataclasses import dataclass
+import copy
+import threading
 import time
 
+from .point_store import Point, PointBatch, PointStore
+from .history import History
+from . import precision
+from .running_stats import RunningStats, ExponentialStats
+from ..utils.tracing import traced
 
-@dataclass
-class Point:
-    x: float
-    y: float
-    inside_circle: bool
+
+# Distance-from-centre histogram kept over the whole run; every point of
+# the square lies within sqrt(2) < DISTANCE_RANGE
+DISTANCE_BINS = 20
+DISTANCE_RANGE = 1.5
+
+
+def distance_histogram(distances_squared: np.ndarray) -> np.ndarray:
+    # Bin counts of sqrt(distances_squared); overwrites its argument to
+    # avoid temporaries on large chunks
+    scaled = np.sqrt(distances_squared, out=distances_squared)
+    scaled *= DISTANCE_BINS / DISTANCE_RANGE
+    counts = np.bincount(scaled.astype(np.intp), minlength=DISTANCE_BINS)
+    # Cheaper than clipping every index; only points beyond the range land here
+    counts[DISTANCE_BINS - 1] += counts[DISTANCE_BINS:].sum()
+    return counts[:DISTANCE_BINS]
+
+
+BIT_GENERATORS = {
+    'PCG64': np.random.PCG64,
+    'PCG64DXSM': np.random.PCG64DXSM,
+    'Philox': np.random.Philox,
+    'SFC64': np.random.SFC64,
+}
+
+
+def create_generator(bit_generator: str, seed_sequence: np.random.SeedSequence) -> np.random.Generator:
+    if bit_generator not in BIT_GENERATORS:
+        raise ValueError(f"Unknown bit generator '{bit_generator}', "
+                         f"expected one of: {', '.join(BIT_GENERATORS)}")
+    return np.random.Generator(BIT_GENERATORS[bit_generator](seed_sequence))
+
+
+class Sampler:
+    # Sampling strategy: produces a whole batch of coordinates in [-1, 1]²
+    # at once. Stateful strategies (sequences) keep their position in
+    # get_state()/set_state() so checkpoints can resume them.
+    name = ''
+    stateful = False
+    
+    def sample(self, rng: np.random.Generator, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        raise NotImplementedError
+    
+    def reset(self):
+        pass
+    
+    def get_state(self) -> dict:
+        return {}
+    
+    def set_state(self, state: dict):
+        pass
+
+
+class UniformSampler(Sampler):
+    name = 'uniform'
+    
+    def sample(self, rng: np.random.Generator, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        return rng.uniform(-1, 1, count), rng.uniform(-1, 1, count)
+
+
+class AntitheticSampler(Sampler):
+    # Pairs every point with its reflection |u| -> 1 - |u| inside the same
+    # quadrant; the indicator is monotone in |x| and |y|, so pairs are
+    # negatively correlated
+    name = 'antithetic'
+    
+    def sample(self, rng: np.random.Generator, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        half = (count + 1) // 2
+        x_half = rng.uniform(-1, 1, half)
+        y_half = rng.uniform(-1, 1, half)
+        
+        x_coords = np.empty(2 * half)
+        y_coords = np.empty(2 * half)
+        x_coords[0::2], y_coords[0::2] = x_half, y_half
+        x_coords[1::2] = np.copysign(1.0 - np.abs(x_half), x_half)
+        y_coords[1::2] = np.copysign(1.0 - np.abs(y_half), y_half)
+        return x_coords[:count], y_coords[:count]
+
+
+class StratifiedSampler(Sampler):
+    # Jittered grid: one uniform point per cell of the largest k×k grid that
+    # fits the batch, the remainder drawn uniformly
+    name = 'stratified'
+    
+    def sample(self, rng: np.random.Generator, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        k = int(np.sqrt(count))
+        cells = np.arange(k * k)
+        x_unit = np.concatenate([(cells % k + rng.random(k * k)) / max(k, 1),
+                                 rng.random(count - k * k)])
+        y_unit = np.concatenate([(cells // k + rng.random(k * k)) / max(k, 1),
+                                 rng.random(count - k * k)])
+        return 2.0 * x_unit - 1.0, 2.0 * y_unit - 1.0
+
+
+class LatinHypercubeSampler(Sampler):
+    name = 'latin_hypercube'
+    
+    def sample(self, rng: np.random.Generator, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        x_unit = (rng.permutation(count) + rng.random(count)) / max(count, 1)
+        y_unit = (rng.permutation(count) + rng.random(count)) / max(count, 1)
+        return 2.0 * x_unit - 1.0, 2.0 * y_unit - 1.0
+
+
+class SobolSampler(Sampler):
+    # Two-dimensional Sobol sequence with a random linear matrix scramble and
+    # digital shift drawn on first use. The sequence continues across batches.
+    name = 'sobol'
+    stateful = True
+    BITS = 52
+    
+    def __init__(self):
+        # Direction numbers: dimension 1 is van der Corput, dimension 2 uses
+        # the primitive polynomial x + 1 (m = 1, 3, 5, 15, 17, ...)
+        first = [1 << (self.BITS - 1 - k) for k in range(self.BITS)]
+        second = [1 << (self.BITS - 1)]
+        for _ in range(self.BITS - 1):
+            second.append(second[-1] ^ (second[-1] >> 1))
+        self.directions = [first, second]
+        self.reset()
+    
+    def reset(self):
+        self.index = 0
+        self.scrambled_directions = None
+        self.shifts = None
+    
+    def _scramble(self, rng: np.random.Generator):
+        scrambled = []
+        for directions in self.directions:
+            # Random lower-triangular bit matrix with a unit diagonal, applied
+            # to each direction number (bit 0 of a row is the most significant)
+            rows = np.tril(rng.integers(0, 2, (self.BITS, self.BITS)), -1) | np.eye(self.BITS, dtype=np.int64)
+            bits = np.array([[(v >> (self.BITS - 1 - i)) & 1 for i in range(self.BITS)]
+                             for v in directions], dtype=np.int64)
+            new_bits = (bits @ rows.T) % 2
+            weights = [1 << (self.BITS - 1 - i) for i in range(self.BITS)]
+            scrambled.append([sum(int(b) * w for b, w in zip(row, weights)) for row in new_bits])
+        self.scrambled_directions = scrambled
+        self.shifts = [int(rng.integers(0, 1 << self.BITS, dtype=np.uint64)) for _ in range(2)]
+    
+    def sample(self, rng: np.random.Generator, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        if self.scrambled_directions is None:
+            self._scramble(rng)
+        indices = np.arange(self.index, self.index + count, dtype=np.uint64)
+        self.index += count
+        
+        coords = []
+        for directions, shift in zip(self.scrambled_directions, self.shifts):
+            values = np.full(count, shift, dtype=np.uint64)
+            for k, direction in enumerate(directions):
+                values ^= np.where((indices >> np.uint64(k)) & np.uint64(1), np.uint64(direction), np.uint64(0))
+            coords.append(2.0 * (values.astype(np.float64) / float(1 << self.BITS)) - 1.0)
+        return coords[0], coords[1]
+    
+    def get_state(self) -> dict:
+        return {
+            'index': self.index,
+            'scrambled_directions': self.scrambled_directions,
+            'shifts': self.shifts,
+        }
+    
+    def set_state(self, state: dict):
+        self.index = state['index']
+        self.scrambled_directions = state['scrambled_directions']
+        self.shifts = state['shifts']
+
+
+class HaltonSampler(Sampler):
+    # Halton sequence in bases 2 and 3 with independent random digit
+    # permutations per digit position, drawn on first use
+    name = 'halton'
+    stateful = True
+    BASES = (2, 3)
+    DIGITS = (52, 33)
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        self.index = 0
+        self.permutations = None
+    
+    def sample(self, rng: np.random.Generator, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        if self.permutations is None:
+            self.permutations = [[rng.permutation(base).tolist() for _ in range(digits)]
+                                 for base, digits in zip(self.BASES, self.DIGITS)]
+        indices = np.arange(self.index, self.index + count, dtype=np.int64)
+        self.index += count
+        
+        coords = []
+        for base, permutations in zip(self.BASES, self.permutations):
+            remaining = indices.copy()
+            values = np.zeros(count)
+            factor = 1.0 / base
+            for permutation in permutations:
+                values += np.asarray(permutation)[remaining % base] * factor
+                remaining //= base
+                factor /= base
+            coords.append(2.0 * values - 1.0)
+        return coords[0], coords[1]
+    
+    def get_state(self) -> dict:
+        return {'index': self.index, 'permutations': self.permutations}
+    
+    def set_state(self, state: dict):
+        self.index = state['index']
+        self.permutations = state['permutations']
+
+
+SAMPLERS = {sampler.name: sampler for sampler in (
+    UniformSampler, AntitheticSampler, StratifiedSampler,
+    LatinHypercubeSampler, SobolSampler, HaltonSampler
+)}
+
+
+def create_sampler(sampler) -> Sampler:
+    if isinstance(sampler, Sampler):
+        return sampler
+    if sampler not in SAMPLERS:
+        raise ValueError(f"Unknown sampler '{sampler}', "
+                         f"expected one of: {', '.join(SAMPLERS)}")
+    return SAMPLERS[sampler]()
 
 
 @dataclass
 class SimulationResult:
-    points: List[Point]
+    points: PointBatch
     pi_estimate: float
     total_points: int
     points_inside: int
     error: float
     computation_time: float
+    batch_size: int = 0
+
+
+@dataclass
+class SimulatorSnapshot:
+    engine: str
+    settings: dict
+    points_inside: int
+    total_points: int
+    histories: Dict[str, np.ndarray]
+    rng_state: dict
+    point_segments: List[PointBatch]
+    distance_counts: Optional[np.ndarray] = None
 
 
 class MonteCarloSimulator:
-    def __init__(self):
+    engine = 'serial'
+    history_names = ('pi_estimates', 'errors', 'computation_times')
+    
+    # With store_points=False the simulator runs in counts-only streaming
+    # mode: samples are generated in chunk_size pieces, reduced to counts and
+    # discarded, and results only carry a preview_size sample for display.
+    # Each simulator owns its Generator; with a seed, reset() replays the run.
+    # recent_window enables exponentially weighted statistics over roughly
+    # that many of the latest batches. max_stored_points caps the store: past
+    # it, points are still counted and handed to the caller but not kept.
+    def __init__(self, store_points: bool = True, chunk_size: int = 1_000_000,
+                 preview_size: int = 1024, seed: Optional[int] = None,
+                 bit_generator: str = 'PCG64', sampler='uniform',
+                 recent_window: Optional[int] = None, max_stored_points: Optional[int] = None):
+        self.seed = seed
+        self.recent_window = recent_window
+        self.bit_generator = bit_generator
+        self.set_sampler(sampler)
+        self.store_points = store_points
+        self.chunk_size = max(1, chunk_size)
+        self.preview_size = max(0, preview_size)
+        self.store = PointStore()
+        self.set_max_stored_points(max_stored_points)
+        self._cancel_event = threading.Event()
         self.reset()
     
     def reset(self):
-        self.points = []
+        self.seed_sequence = np.random.SeedSequence(self.seed)
+        self.rng = create_generator(self.bit_generator, self.seed_sequence)
+        self.sampler.reset()
+        self.store.clear()
         self.points_inside = 0
         self.total_points = 0
-        self.pi_estimates = []
-        self.errors = []
-        self.computation_times = []
+        self.distance_counts = np.zeros(DISTANCE_BINS, dtype=np.int64)
+        # One value per batch; the convergence series keep a decimation
+        # pyramid so plots cost the same however long the run is
+        self.pi_estimates = History()
+        self.errors = History()
+        self.computation_times = History(decimate=False)
+        
+        # Running accumulators keep get_statistics O(1) per call
+        self.estimate_stats = RunningStats()
+        self.error_stats = RunningStats()
+        self.time_stats = RunningStats()
+        self.recent_estimate_stats = ExponentialStats(self.recent_window) if self.recent_window else None
+        self.recent_error_stats = ExponentialStats(self.recent_window) if self.recent_window else None
+    
+    def set_sampler(self, sampler):
+        # Every strategy is unbiased batch by batch, so switching mid-run
+        # keeps the running estimate valid
+        self.sampler = create_sampler(sampler)
     
+    def set_max_stored_points(self, limit: Optional[int]):
+        self.max_stored_points = limit
+        # The buffers never need to grow past the cap
+        self.store.max_capacity = limit
+        
+    @property
+    def store_full(self) -> bool:
+        return (self.store_points and self.max_stored_points is not None
+                and len(self.store) >= self.max_stored_points)
+        
     def generate_random_point(self) -> Point:
-        x = np.random.uniform(-1, 1)
-        y = np.random.uniform(-1, 1)
+        x_coords, y_coords = self.sampler.sample(self.rng, 1)
+        x, y = float(x_coords[0]), float(y_coords[0])
         inside_circle = (x**2 + y**2) <= 1.0
         return Point(x, y, inside_circle)
     
-    def generate_batch_points(self, count: int) -> List[Point]:
-        x_coords = np.random.uniform(-1, 1, count)
-        y_coords = np.random.uniform(-1, 1, count)
+    def generate_batch_points(self, count: int) -> PointBatch:
+        return self._generate_chunk(count)[0]
+    
+    def _generate_chunk(self, count: int) -> Tuple[PointBatch, np.ndarray]:
+        # Also returns the squared distances so callers can bin them
+        x_coords, y_coords = self.sampler.sample(self.rng, count)
         distances_squared = x_coords**2 + y_coords**2
         inside_mask = distances_squared <= 1.0
         
-        points = [Point(x_coords[i], y_coords[i], inside_mask[i]) for i in range(count)]
-        
-        return points
+        return PointBatch(x_coords, y_coords, inside_mask), distances_squared
     
+    @traced(category='simulation')
     def add_points(self, count: int) -> SimulationResult:
         start_time = time.time()
+        self._cancel_event.clear()
         
-        new_points = self.generate_batch_points(count)
-        self.points.extend(new_points)
+        sampled, new_inside, new_points = self.sample_points(count)
         
-        new_inside = sum(p.inside_circle for p in new_points)
         self.points_inside += new_inside
-        self.total_points += count
+        self.total_points += sampled
         
         pi_estimate = 4.0 * self.points_inside / self.total_points if self.total_points > 0 else 0.0
         error = abs(pi_estimate - np.pi)
         computation_time = time.time() - start_time
         
-        self.pi_estimates.append(pi_estimate)
-        self.errors.append(error)
-        self.computation_times.append(computation_time)
+        # A request cancelled before any sampling leaves the history untouched
+        if sampled > 0:
+            self.pi_estimates.append(pi_estimate)
+            self.errors.append(error)
+            self.computation_times.append(computation_time)
+            self.estimate_stats.update(pi_estimate)
+            self.error_stats.update(error)
+            self.time_stats.update(computation_time)
+            if self.recent_estimate_stats is not None:
+                self.recent_estimate_stats.update(pi_estimate)
+                self.recent_error_stats.update(error)
         
         return SimulationResult(
             points=new_points,
@@ -73,24 +369,183 @@ class MonteCarloSimulator:
             total_points=self.total_points,
             points_inside=self.points_inside,
             error=error,
-            computation_time=computation_time
+            computation_time=computation_time,
+            batch_size=sampled
+        )
+    
+    def sample_points(self, count: int) -> Tuple[int, int, PointBatch]:
+        # Returns the number of points sampled (fewer than requested after
+        # cancel()), the inside count and the points to hand to the caller:
+        # every new point when storing, otherwise a bounded preview
+        store_start = len(self.store)
+        new_inside = 0
+        last_chunk = PointBatch.empty()
+        chunks = []
+        stored_all = True
+        
+        remaining = count
+        while remaining > 0 and not self._cancel_event.is_set():
+            chunk, distances_squared = self._generate_chunk(min(remaining, self.chunk_size))
+            new_inside += int(np.count_nonzero(chunk.inside))
+            self.distance_counts += distance_histogram(distances_squared)
+            if self.store_points:
+                room = len(chunk)
+                if self.max_stored_points is not None:
+                    room = max(0, self.max_stored_points - len(self.store))
+                self.store.append(chunk.head(room))
+                stored_all = stored_all and room >= len(chunk)
+                chunks.append(chunk)
+            last_chunk = chunk
+            remaining -= len(chunk)
+            
+        sampled = count - remaining
+        if self.store_points and stored_all:
+            return sampled, new_inside, self.store.slice(store_start, len(self.store))
+        if self.store_points:
+            # Past the cap the caller still gets every new point
+            return sampled, new_inside, PointBatch.concatenate(chunks)
+        return sampled, new_inside, last_chunk.tail(self.preview_size)
+    
+    def get_settings(self) -> dict:
+        return {
+            'store_points': self.store_points,
+            'chunk_size': self.chunk_size,
+            'preview_size': self.preview_size,
+            'seed': self.seed,
+            'bit_generator': self.bit_generator,
+            'sampler': self.sampler.name,
+            'recent_window': self.recent_window,
+            'max_stored_points': self.max_stored_points,
+        }
+    
+    def snapshot(self) -> SimulatorSnapshot:
+        # Cheap enough to take under the worker lock: histories are copied,
+        # points are views that later appends never overwrite
+        return SimulatorSnapshot(
+            engine=self.engine,
+            settings=self.get_settings(),
+            points_inside=self.points_inside,
+            total_points=self.total_points,
+            histories={name: getattr(self, name).values.copy() for name in self.history_names},
+            rng_state=copy.deepcopy(self.get_rng_state()),
+            point_segments=self.store.segments(),
+            distance_counts=self.distance_counts.copy()
+        )
+    
+    def restore(self, snapshot: SimulatorSnapshot):
+        self.reset()
+        self.points_inside = snapshot.points_inside
+        self.total_points = snapshot.total_points
+        for name in self.history_names:
+            if name in snapshot.histories:
+                getattr(self, name).extend(snapshot.histories[name])
+        self.rebuild_statistics()
+        self.store.set_base(PointBatch.concatenate(snapshot.point_segments))
+        if snapshot.distance_counts is not None:
+            self.distance_counts[:] = snapshot.distance_counts
+        else:
+            # Snapshots from before the histogram existed; only stored points can be binned
+            for chunk in self.store.iter_chunks(self.chunk_size):
+                self.distance_counts += distance_histogram(chunk.x**2 + chunk.y**2)
+        self.set_rng_state(snapshot.rng_state)
+    
+    def get_current_result(self) -> SimulationResult:
+        pi_estimate = self.get_current_estimate()
+        return SimulationResult(
+            points=PointBatch.empty(),
+            pi_estimate=pi_estimate,
+            total_points=self.total_points,
+            points_inside=self.points_inside,
+            error=abs(pi_estimate - np.pi) if self.total_points > 0 else 0.0,
+            computation_time=self.computation_times[-1] if self.computation_times else 0.0
         )
     
+    def get_rng_state(self) -> dict:
+        return {
+            'bit_generator': self.bit_generator,
+            'state': self.rng.bit_generator.state,
+            'sampler': self.sampler.get_state(),
+        }
+    
+    def set_rng_state(self, state: dict):
+        if state['bit_generator'] != self.bit_generator:
+            self.bit_generator = state['bit_generator']
+            self.rng = create_generator(self.bit_generator, self.seed_sequence)
+        self.rng.bit_generator.state = state['state']
+        self.sampler.set_state(state.get('sampler', {}))
+    
+    def cancel(self):
+        # Safe to call from another thread; the running add_points stops at
+        # the next chunk boundary and records what was sampled so far
+        self._cancel_event.set()
+    
+    def shutdown(self):
+        self.cancel()
+    
     def get_current_estimate(self) -> float:
         if self.total_points == 0:
             return 0.0
         return 4.0 * self.points_inside / self.total_points
     
-    def get_convergence_data(self) -> Tuple[List[int], List[float], List[float]]:
-        x_data = list(range(0, len(self.pi_estimates)))
-        return x_data, self.pi_estimates.copy(), self.errors.copy()
+    def get_standard_error(self) -> float:
+        return precision.standard_error(self.points_inside, self.total_points)
+    
+    def get_confidence_interval(self, confidence: float = 0.95) -> Tuple[float, float]:
+        return precision.confidence_interval(self.points_inside, self.total_points, confidence)
+    
+    def precision_reached(self, target_half_width: float, confidence: float = 0.95) -> bool:
+        return precision.precision_reached(self.points_inside, self.total_points,
+                                           target_half_width, confidence)
+    
+    def plan_precision(self, target_half_width: float, confidence: float = 0.95) -> precision.SampleSizePlan:
+        # Wall time is extrapolated from the sampling time measured so far
+        elapsed = self.time_stats.total
+        points_per_second = self.total_points / elapsed if elapsed > 0 else None
+        return precision.plan_sample_size(target_half_width, confidence, self.points_inside,
+                                          self.total_points, points_per_second)
+    
+    def get_distance_histogram(self) -> Tuple[np.ndarray, np.ndarray]:
+        # (bin edges, counts) over every sample of the run
+        edges = np.linspace(0.0, DISTANCE_RANGE, DISTANCE_BINS + 1)
+        return edges, self.distance_counts.copy()
+    
+    def get_convergence_data(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Full series; plots should use pi_estimates/errors.decimate() instead
+        x_data = np.arange(len(self.pi_estimates))
+        return x_data, self.pi_estimates.values.copy(), self.errors.values.copy()
+    
+    def memory_usage(self) -> Dict[str, int]:
+        # Bytes held by the point store and the per-batch histories
+        return {
+            "store": self.store.nbytes,
+            "history": sum(getattr(self, name).nbytes for name in self.history_names),
+            "distance_counts": self.distance_counts.nbytes,
+        }
+    
+    @property
+    def points(self) -> PointBatch:
+        return self.store.view()
+    
+    def get_all_points(self) -> PointBatch:
+        return self.store.view()
     
-    def get_all_points(self) -> List[Point]:
-        return self.points.copy()
+    def get_all_point_objects(self) -> List[Point]:
+        return self.store.view().to_points()
+    
+    def rebuild_statistics(self):
+        # One pass over the stored histories, e.g. after restoring a checkpoint
+        for stats, values in ((self.estimate_stats, self.pi_estimates),
+                              (self.error_stats, self.errors),
+                              (self.time_stats, self.computation_times),
+                              (self.recent_estimate_stats, self.pi_estimates),
+                              (self.recent_error_stats, self.errors)):
+            if stats is not None:
+                stats.reset()
+                stats.update_many(values.values)
     
     def get_statistics(self) -> dict:
-        if not self.pi_estimates:
-            return {
+        if self.estimate_stats.count == 0:
+            stats = {
                 'mean_estimate': 0.0,
                 'std_estimate': 0.0,
                 'min_error': 0.0,
@@ -98,14 +553,62 @@ class MonteCarloSimulator:
                 'mean_error': 0.0,
                 'total_computation_time': 0.0
             }
+        else:
+            stats = {
+                'mean_estimate': self.estimate_stats.mean,
+                'std_estimate': self.estimate_stats.std,
+                'min_error': self.error_stats.min,
+                'max_error': self.error_stats.max,
+                'mean_error': self.error_stats.mean,
+                'total_computation_time': self.time_stats.total
+            }
         
-        return {
-            'mean_estimate': np.mean(self.pi_estimates),
-            'std_estimate': np.std(self.pi_estimates),
-            'min_error': np.min(self.errors),
-            'max_error': np.max(self.errors),
-            'mean_error': np.mean(self.errors),
-            'total_computation_time': np.sum(self.computation_times)
-        }
+        if self.recent_estimate_stats is not None:
+            stats['recent_mean_estimate'] = self.recent_estimate_stats.mean
+            stats['recent_std_estimate'] = self.recent_estimate_stats.std
+            stats['recent_mean_error'] = self.recent_error_stats.mean
+        
+        return stats
 
 
+@dataclass
+class SamplerComparison:
+    sampler: str
+    points_needed: Optional[int]
+    wall_time: float
+    rmse: float
+
+
+def compare_samplers(target_error: float, samplers: Optional[List[str]] = None, replicates: int = 8,
+                     start_points: int = 1024, max_points: int = 1 << 22, seed: Optional[int] = None,
+                     bit_generator: str = 'PCG64') -> List[SamplerComparison]:
+    # For each strategy, finds the smallest power-of-two sample size whose
+    # RMSE over independent replicates is within target_error, and the wall
+    # time one run of that size takes. points_needed is None when max_points
+    # is not enough.
+    seed_sequence = np.random.SeedSequence(seed)
+    comparisons = []
+    
+    for name in samplers or list(SAMPLERS):
+        count = start_points
+        comparison = SamplerComparison(name, None, 0.0, float('nan'))
+        while count <= max_points:
+            errors = []
+            start_time = time.perf_counter()
+            for child in seed_sequence.spawn(replicates):
+                rng = create_generator(bit_generator, child)
+                x_coords, y_coords = create_sampler(name).sample(rng, count)
+                inside = np.count_nonzero(x_coords**2 + y_coords**2 <= 1.0)
+                errors.append(4.0 * inside / count - np.pi)
+            wall_time = (time.perf_counter() - start_time) / replicates
+            rmse = float(np.sqrt(np.mean(np.square(errors))))
+            
+            reached = rmse <= target_error
+            comparison = SamplerComparison(name, count if reached else None, wall_time, rmse)
+            if reached:
+                break
+            count *= 2
+            
+        comparisons.append(comparison)
+    
+    return comparisons
@@ -0,0 +1,225 @@
+import numpy as np
+from typing import Tuple, List, Optional
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+import multiprocessing
+import os
+import threading
+import time
+
+from .monte_carlo import MonteCarloSimulator, create_generator, create_sampler, distance_histogram
+from .running_stats import RunningStats
+from .point_store import PointBatch
+from .history import History
+
+
+def sample_shard(bit_generator: str, sampler: str, seed_sequence: np.random.SeedSequence,
+                 count: int, chunk_size: int,
+                 preview_size: int) -> Tuple[int, float, PointBatch, np.ndarray]:
+    # Runs inside a worker process: counts points inside the circle and bins
+    # their distances for one shard drawn from its own independent stream
+    start_time = time.perf_counter()
+    rng = create_generator(bit_generator, seed_sequence)
+    shard_sampler = create_sampler(sampler)
+
+    inside = 0
+    distance_counts = 0
+    x_coords = y_coords = np.empty(0)
+    remaining = count
+    while remaining > 0:
+        chunk = min(remaining, chunk_size)
+        x_coords, y_coords = shard_sampler.sample(rng, chunk)
+        distances_squared = x_coords**2 + y_coords**2
+        inside += int(np.count_nonzero(distances_squared <= 1.0))
+        distance_counts = distance_counts + distance_histogram(distances_squared)
+        remaining -= chunk
+
+    preview_x = x_coords[-preview_size:] if preview_size > 0 else x_coords[:0]
+    preview_y = y_coords[-preview_size:] if preview_size > 0 else y_coords[:0]
+    preview = PointBatch(preview_x.copy(), preview_y.copy(), preview_x**2 + preview_y**2 <= 1.0)
+
+    return inside, time.perf_counter() - start_time, preview, distance_counts
+
+
+class ParallelMonteCarloSimulator(MonteCarloSimulator):
+    # Counts-only engine that shards every add_points request across a
+    # persistent process pool: at least one shard per worker, none larger
+    # than shard_size. Each shard gets the next child of the run's
+    # SeedSequence, so a seeded run with the same worker count and batch
+    # sizes produces the same counts, however often it is paused.
+    engine = 'parallel'
+    history_names = MonteCarloSimulator.history_names + ('worker_computation_times',)
+
+    def __init__(self, workers: Optional[int] = None, seed: Optional[int] = None,
+                 shard_size: int = 1 << 20, chunk_size: int = 1 << 18,
+                 preview_size: int = 1024, min_parallel_count: int = 1 << 16,
+                 bit_generator: str = 'PCG64', sampler='uniform',
+                 recent_window: Optional[int] = None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.shard_size = max(1, shard_size)
+        self.min_parallel_count = min_parallel_count
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._futures = []
+        self._futures_lock = threading.Lock()
+        super().__init__(store_points=False, chunk_size=chunk_size, preview_size=preview_size,
+                         seed=seed, bit_generator=bit_generator, sampler=sampler,
+                         recent_window=recent_window)
+
+    def reset(self):
+        self.cancel()
+        super().reset()
+        self.worker_computation_times = History(decimate=False)
+        self.worker_time_stats = RunningStats()
+
+    def set_sampler(self, sampler):
+        # Shards are independent designs, so sequence samplers that carry
+        # state from one batch to the next cannot be split across workers
+        sampler = create_sampler(sampler)
+        if sampler.stateful:
+            raise ValueError(f"The '{sampler.name}' sampler is not supported by the parallel engine")
+        self.sampler = sampler
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn keeps workers independent of the Qt threads in the parent
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+
+    def shard_counts(self, count: int) -> List[int]:
+        # At least one shard per worker so every request keeps the whole pool
+        # busy, split evenly and never larger than shard_size
+        shards = max(self.workers, -(-count // self.shard_size))
+        shards = min(shards, count)
+        size, extra = divmod(count, shards) if shards else (0, 0)
+        return [size + 1] * extra + [size] * (shards - extra)
+
+    def child_seeds(self, count: int) -> List[np.random.SeedSequence]:
+        # The next children of the run's SeedSequence, without spawning them
+        root = self.seed_sequence
+        first = root.n_children_spawned
+        return [np.random.SeedSequence(root.entropy, spawn_key=root.spawn_key + (first + index,),
+                                       pool_size=root.pool_size)
+                for index in range(count)]
+
+    def advance_seed_sequence(self, children: int):
+        root = self.seed_sequence
+        self.seed_sequence = np.random.SeedSequence(root.entropy, spawn_key=root.spawn_key,
+                                                    pool_size=root.pool_size,
+                                                    n_children_spawned=root.n_children_spawned + children)
+
+    def sample_points(self, count: int) -> Tuple[int, int, PointBatch]:
+        shard_counts = self.shard_counts(count)
+        seeds = self.child_seeds(len(shard_counts))
+
+        if count < self.min_parallel_count or self.workers == 1:
+            # Not worth a round trip to the pool; same streams, same result
+            results = []
+            for seed, shard_count in zip(seeds, shard_counts):
+                if self._cancel_event.is_set():
+                    break
+                results.append((shard_count, sample_shard(self.bit_generator, self.sampler.name, seed,
+                                                          shard_count, self.chunk_size, self.preview_size)))
+        else:
+            results = self._run_shards(seeds, shard_counts)
+        # Only children of shards that ran are used up, so a cancelled
+        # request resumes exactly where an uninterrupted run would be
+        self.advance_seed_sequence(len(results))
+
+        sampled = sum(shard_count for shard_count, _ in results)
+        new_inside = sum(inside for _, (inside, _, _, _) in results)
+        worker_time = sum(elapsed for _, (_, elapsed, _, _) in results)
+        for _, (_, _, _, distance_counts) in results:
+            self.distance_counts += distance_counts
+        if sampled > 0:
+            self.worker_computation_times.append(worker_time)
+            self.worker_time_stats.update(worker_time)
+        preview = results[-1][1][2] if results else PointBatch.empty()
+
+        return sampled, new_inside, preview
+
+    def _run_shards(self, seeds: List[np.random.SeedSequence],
+                    shard_counts: List[int]) -> List[Tuple[int, tuple]]:
+        executor = self._get_executor()
+        with self._futures_lock:
+            if self._cancel_event.is_set():
+                return []
+            self._futures = [
+                executor.submit(sample_shard, self.bit_generator, self.sampler.name, seed,
+                                shard_count, self.chunk_size, self.preview_size)
+                for seed, shard_count in zip(seeds, shard_counts)
+            ]
+            futures = self._futures
+
+        # Reduce in submission order so the merge is deterministic. cancel()
+        # only stops shards that have not started and the pool starts them in
+        # order, so the shards that ran form a prefix; results after the first
+        # cancelled shard are dropped to keep it one.
+        results = []
+        for future, shard_count in zip(futures, shard_counts):
+            try:
+                result = future.result()
+            except CancelledError:
+                break
+            results.append((shard_count, result))
+        for future in futures[len(results):]:
+            future.cancel()
+
+        with self._futures_lock:
+            self._futures = []
+        return results
+
+    def get_settings(self) -> dict:
+        return {
+            'workers': self.workers,
+            'seed': self.seed,
+            'shard_size': self.shard_size,
+            'chunk_size': self.chunk_size,
+            'preview_size': self.preview_size,
+            'min_parallel_count': self.min_parallel_count,
+            'bit_generator': self.bit_generator,
+            'sampler': self.sampler.name,
+            'recent_window': self.recent_window,
+        }
+
+    def rebuild_statistics(self):
+        super().rebuild_statistics()
+        self.worker_time_stats.reset()
+        self.worker_time_stats.update_many(self.worker_computation_times.values)
+
+    def get_rng_state(self) -> dict:
+        # Workers are seeded from spawned children, so the run position is
+        # the root entropy plus how many children have been handed out
+        return {
+            'bit_generator': self.bit_generator,
+            'entropy': self.seed_sequence.entropy,
+            'n_children_spawned': self.seed_sequence.n_children_spawned,
+        }
+
+    def set_rng_state(self, state: dict):
+        self.bit_generator = state['bit_generator']
+        self.seed_sequence = np.random.SeedSequence(
+            state['entropy'], n_children_spawned=state['n_children_spawned']
+        )
+
+    def cancel(self):
+        super().cancel()
+        # Queued shards are dropped; shards already running finish and count
+        with self._futures_lock:
+            for future in self._futures:
+                future.cancel()
+
+    def shutdown(self):
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_statistics(self) -> dict:
+        stats = super().get_statistics()
+        worker_time = self.worker_time_stats.total
+        wall_time = stats['total_computation_time']
+        stats['total_worker_time'] = worker_time
+        stats['parallel_efficiency'] = worker_time / (wall_time * self.workers) if wall_time > 0 else 0.0
+        return stats
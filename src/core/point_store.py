@@ -0,0 +1,184 @@
+import numpy as np
+from typing import List, Iterable, Optional
+from dataclasses import dataclass
+
+
+@dataclass
+class Point:
+    x: float
+    y: float
+    inside_circle: bool
+
+
+@dataclass
+class PointBatch:
+    x: np.ndarray
+    y: np.ndarray
+    inside: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    @property
+    def nbytes(self) -> int:
+        return self.x.nbytes + self.y.nbytes + self.inside.nbytes
+
+    @classmethod
+    def empty(cls) -> 'PointBatch':
+        return cls(np.empty(0, dtype=np.float64),
+                   np.empty(0, dtype=np.float64),
+                   np.empty(0, dtype=bool))
+
+    @classmethod
+    def concatenate(cls, batches: Iterable['PointBatch']) -> 'PointBatch':
+        batches = [batch for batch in batches if len(batch) > 0]
+        if not batches:
+            return cls.empty()
+        if len(batches) == 1:
+            return batches[0]
+        return cls(np.concatenate([batch.x for batch in batches]),
+                   np.concatenate([batch.y for batch in batches]),
+                   np.concatenate([batch.inside for batch in batches]))
+
+    def head(self, count: int) -> 'PointBatch':
+        if count >= len(self):
+            return self
+        end = max(0, count)
+        return PointBatch(self.x[:end], self.y[:end], self.inside[:end])
+
+    def tail(self, count: int) -> 'PointBatch':
+        if count >= len(self):
+            return self
+        start = len(self) - max(0, count)
+        return PointBatch(self.x[start:], self.y[start:], self.inside[start:])
+
+    def to_points(self) -> List[Point]:
+        # Compatibility shim for code that still expects Point objects
+        return [Point(float(x), float(y), bool(inside))
+                for x, y, inside in zip(self.x, self.y, self.inside)]
+
+
+class PointStore:
+    # Struct-of-arrays buffers with amortised doubling; reads are views
+    # of the filled prefix, so nothing is copied per point. A read-only base
+    # segment (e.g. memory-mapped arrays from a checkpoint) can sit in front
+    # of the growable buffers so resumed runs are never read up front.
+    def __init__(self, initial_capacity: int = 1024, max_capacity: Optional[int] = None):
+        self.initial_capacity = max(1, initial_capacity)
+        self.max_capacity = max_capacity  # doubling stops here
+        self.clear()
+
+    def clear(self):
+        self._base = PointBatch.empty()
+        self._x = np.empty(self.initial_capacity, dtype=np.float64)
+        self._y = np.empty(self.initial_capacity, dtype=np.float64)
+        self._inside = np.empty(self.initial_capacity, dtype=bool)
+        self._size = 0
+
+    def set_base(self, base: PointBatch):
+        self.clear()
+        self._base = base
+
+    def __len__(self) -> int:
+        return len(self._base) + self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._x)
+
+    @property
+    def nbytes(self) -> int:
+        # Memory-mapped base arrays are backed by the page cache, not counted
+        return self._x.nbytes + self._y.nbytes + self._inside.nbytes
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.view().x
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.view().y
+
+    @property
+    def inside(self) -> np.ndarray:
+        return self.view().inside
+
+    def reserve(self, required: int):
+        if required <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < required:
+            capacity *= 2
+        if self.max_capacity is not None:
+            capacity = max(required, min(capacity, self.max_capacity))
+        self._x = self._grow(self._x, capacity)
+        self._y = self._grow(self._y, capacity)
+        self._inside = self._grow(self._inside, capacity)
+
+    def _grow(self, buffer: np.ndarray, capacity: int) -> np.ndarray:
+        grown = np.empty(capacity, dtype=buffer.dtype)
+        grown[:self._size] = buffer[:self._size]
+        return grown
+
+    def append(self, batch: PointBatch):
+        count = len(batch)
+        if count == 0:
+            return
+        end = self._size + count
+        self.reserve(end)
+        self._x[self._size:end] = batch.x
+        self._y[self._size:end] = batch.y
+        self._inside[self._size:end] = batch.inside
+        self._size = end
+
+    def view(self) -> PointBatch:
+        return self.slice(0, len(self))
+
+    def slice(self, start: int, end: int) -> PointBatch:
+        # Zero-copy unless the range spans the base segment and the buffers
+        base_size = len(self._base)
+        start, end = max(0, start), min(end, len(self))
+        if start >= base_size:
+            start, end = start - base_size, end - base_size
+            return PointBatch(self._x[start:end], self._y[start:end], self._inside[start:end])
+        base_part = PointBatch(self._base.x[start:end], self._base.y[start:end],
+                               self._base.inside[start:end])
+        if end <= base_size:
+            return base_part
+        return PointBatch.concatenate([base_part, self.slice(base_size, end)])
+
+    def tail(self, count: int) -> PointBatch:
+        return self.slice(len(self) - max(0, count), len(self))
+
+    def take(self, indices: np.ndarray) -> PointBatch:
+        # Gathers arbitrary points, reading the base segment only where asked
+        indices = np.asarray(indices, dtype=np.int64)
+        base_size = len(self._base)
+        if base_size == 0:
+            return PointBatch(self._x[indices], self._y[indices], self._inside[indices])
+        in_base = indices < base_size
+        result = PointBatch(np.empty(len(indices), dtype=np.float64),
+                            np.empty(len(indices), dtype=np.float64),
+                            np.empty(len(indices), dtype=bool))
+        base_indices = indices[in_base]
+        buffer_indices = indices[~in_base] - base_size
+        for target, base, buffer in ((result.x, self._base.x, self._x),
+                                     (result.y, self._base.y, self._y),
+                                     (result.inside, self._base.inside, self._inside)):
+            target[in_base] = base[base_indices]
+            target[~in_base] = buffer[buffer_indices]
+        return result
+
+    def sample(self, count: int, rng: np.random.Generator) -> PointBatch:
+        # Uniform sample without replacement, gathered in index order so a
+        # memory-mapped base is read front to back
+        count = min(max(0, count), len(self))
+        return self.take(np.sort(rng.choice(len(self), count, replace=False)))
+
+    def segments(self) -> List[PointBatch]:
+        segments = [self._base, self.slice(len(self._base), len(self))]
+        return [segment for segment in segments if len(segment) > 0]
+
+    def iter_chunks(self, chunk_size: int):
+        for start in range(0, len(self), chunk_size):
+            yield self.slice(start, start + chunk_size)
@@ -0,0 +1,63 @@
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Optional, Tuple
+
+
+# Each point is a Bernoulli trial with p = π/4 and π̂ = 4·p̂, so the standard
+# error of π̂ is 4·sqrt(p̂(1 - p̂)/n). Everything here works from the running
+# counts and costs O(1). The binomial error is exact for independent uniform
+# sampling and conservative for the variance-reducing samplers.
+# The normal approximation needs a few of each outcome before it means much.
+MIN_OUTCOME_COUNT = 10
+
+
+def z_value(confidence: float) -> float:
+    if not 0.0 < confidence < 1.0:
+        raise ValueError(f"Confidence must be between 0 and 1, got {confidence}")
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def standard_error(points_inside: int, total_points: int) -> float:
+    if total_points <= 0:
+        return math.inf
+    p = points_inside / total_points
+    return 4.0 * math.sqrt(p * (1.0 - p) / total_points)
+
+
+def confidence_interval(points_inside: int, total_points: int,
+                        confidence: float = 0.95) -> Tuple[float, float]:
+    if total_points <= 0:
+        return -math.inf, math.inf
+    estimate = 4.0 * points_inside / total_points
+    half_width = z_value(confidence) * standard_error(points_inside, total_points)
+    return estimate - half_width, estimate + half_width
+
+
+def precision_reached(points_inside: int, total_points: int, target_half_width: float,
+                      confidence: float = 0.95) -> bool:
+    if min(points_inside, total_points - points_inside) < MIN_OUTCOME_COUNT:
+        return False
+    return z_value(confidence) * standard_error(points_inside, total_points) <= target_half_width
+
+
+@dataclass
+class SampleSizePlan:
+    target_half_width: float
+    confidence: float
+    points_needed: int  # over the whole run
+    points_remaining: int
+    seconds_remaining: Optional[float]  # None until a throughput is known
+
+
+def plan_sample_size(target_half_width: float, confidence: float = 0.95, points_inside: int = 0,
+                     total_points: int = 0,
+                     points_per_second: Optional[float] = None) -> SampleSizePlan:
+    # n = (z · 4 · sqrt(p(1 - p)) / ε)², with p from the run so far or π/4
+    if target_half_width <= 0:
+        raise ValueError(f"Target half-width must be positive, got {target_half_width}")
+    p = points_inside / total_points if total_points >= 100 else math.pi / 4
+    points_needed = math.ceil((z_value(confidence) * 4.0 / target_half_width) ** 2 * p * (1.0 - p))
+    remaining = max(0, points_needed - total_points)
+    seconds = remaining / points_per_second if points_per_second else None
+    return SampleSizePlan(target_half_width, confidence, points_needed, remaining, seconds)
@@ -0,0 +1,92 @@
+import numpy as np
+from typing import Optional
+
+from .point_store import PointBatch
+
+
+RESERVOIR_MODES = ('uniform', 'recent')
+
+
+class PointReservoir:
+    # Fixed-capacity display sample. 'recent' is a ring buffer holding the
+    # newest points; 'uniform' is reservoir sampling (Algorithm R, vectorised
+    # per batch), so every point seen so far is equally likely to be held.
+    # Insertion is O(batch) and never copies the buffer.
+    def __init__(self, capacity: int, mode: str = 'uniform', seed: Optional[int] = None):
+        self.capacity = max(1, capacity)
+        self.set_mode(mode)
+        self.rng = np.random.default_rng(seed)
+        self.x = np.empty(self.capacity, dtype=np.float64)
+        self.y = np.empty(self.capacity, dtype=np.float64)
+        self.inside = np.empty(self.capacity, dtype=bool)
+        self.clear()
+
+    def clear(self):
+        self.size = 0
+        self.seen = 0
+        self.position = 0  # next ring slot in 'recent' mode
+        self.points_inside = 0
+        self.replaced = 0  # points admitted and later overwritten, since clear
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        return self.x.nbytes + self.y.nbytes + self.inside.nbytes
+
+    def set_mode(self, mode: str):
+        if mode not in RESERVOIR_MODES:
+            raise ValueError(f"Unknown reservoir mode '{mode}'. Choose from: {', '.join(RESERVOIR_MODES)}")
+        self.mode = mode
+
+    def view(self) -> PointBatch:
+        return PointBatch(self.x[:self.size], self.y[:self.size], self.inside[:self.size])
+
+    def load(self, sample: PointBatch, seen: int):
+        # Replaces the contents with a sample drawn elsewhere, uniformly from
+        # `seen` points, so later adds carry on as if they had all been offered
+        self.clear()
+        count = min(len(sample), self.capacity)
+        self.x[:count] = sample.x[:count]
+        self.y[:count] = sample.y[:count]
+        self.inside[:count] = sample.inside[:count]
+        self.size = count
+        self.seen = max(seen, count)
+        self.position = count % self.capacity
+        self.points_inside = int(np.count_nonzero(self.inside[:count]))
+
+    def add(self, batch: PointBatch) -> PointBatch:
+        # Returns the points that entered the buffer
+        count = len(batch)
+        if count == 0:
+            return batch
+
+        if self.mode == 'recent':
+            admitted = batch.tail(self.capacity)
+            slots = (self.position + np.arange(len(admitted))) % self.capacity
+            self.position = int(slots[-1] + 1) % self.capacity
+        else:
+            # Point n (0-based over the whole run) lands in slot randint(0, n)
+            # and is kept if that slot exists; the first `capacity` points
+            # always fill the next free slot
+            index = self.seen + np.arange(count)
+            slots = np.where(index < self.capacity, index, self.rng.integers(0, index + 1))
+            keep = slots < self.capacity
+            # Later points win when several pick the same slot
+            slots, last = np.unique(slots[keep][::-1], return_index=True)
+            picked = np.flatnonzero(keep)[::-1][last]
+            admitted = PointBatch(batch.x[picked], batch.y[picked], batch.inside[picked])
+        self.seen += count
+        if len(slots) == 0:
+            return admitted
+
+        replaced = slots[slots < self.size]
+        self.replaced += len(replaced)
+        self.points_inside -= int(np.count_nonzero(self.inside[replaced]))
+        self.x[slots] = admitted.x
+        self.y[slots] = admitted.y
+        self.inside[slots] = admitted.inside
+        self.points_inside += int(np.count_nonzero(admitted.inside))
+        self.size = min(self.capacity, max(self.size, int(slots.max()) + 1))
+        return admitted
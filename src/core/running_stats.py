@@ -0,0 +1,84 @@
+import numpy as np
+import math
+
+
+class RunningStats:
+    # Welford mean/variance plus min, max and total, updated in O(1) per
+    # value. Variance is the population variance, matching np.var/np.std.
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.total = 0.0
+
+    def update(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.total += value
+
+    def update_many(self, values: np.ndarray):
+        # Chan et al. pairwise merge, used to rebuild from a stored history
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        count = len(values)
+        mean = float(np.mean(values))
+        m2 = float(np.sum((values - mean) ** 2))
+
+        total_count = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta * delta * self.count * count / total_count
+        self.mean += delta * count / total_count
+        self.count = total_count
+        self.min = min(self.min, float(np.min(values)))
+        self.max = max(self.max, float(np.max(values)))
+        self.total += float(np.sum(values))
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count > 0 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class ExponentialStats:
+    # Exponentially weighted mean/variance; alpha = 2 / (window + 1) gives
+    # roughly the weight of a moving window of that many values
+    def __init__(self, window: int):
+        self.window = max(1, window)
+        self.alpha = 2.0 / (self.window + 1)
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+
+    def update(self, value: float):
+        # Until the window has filled this is a plain running mean, so the
+        # first values do not dominate the start of the run
+        self.count += 1
+        alpha = max(self.alpha, 1.0 / self.count)
+        delta = value - self.mean
+        increment = alpha * delta
+        self.mean += increment
+        self.variance = (1.0 - alpha) * (self.variance + delta * increment)
+
+    def update_many(self, values: np.ndarray):
+        for value in np.asarray(values, dtype=np.float64)[-10 * self.window:]:
+            self.update(float(value))
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
@@ -0,0 +1,74 @@
+import numpy as np
+from typing import List, Optional, Tuple
+
+from .point_store import PointBatch
+
+
+class GridIndex:
+    # Uniform grid over [-1,1] x [-1,1] mapping cells to store indices. Points
+    # are kept in sorted runs: each run holds its store indices ordered by
+    # cell (row-major), so one row of cells is one contiguous slice found by
+    # binary search. New points form a new run and runs of similar size are
+    # merged, as in a log-structured merge tree, so there are O(log n) runs,
+    # appends are amortised O(log n) per point and a rectangle query costs
+    # O(rows * runs) searches plus the points in the overlapped cells.
+    def __init__(self, resolution: int = 512):
+        self.resolution = resolution
+        self.clear()
+
+    def clear(self):
+        self.count = 0  # store points indexed so far
+        self._runs: List[Tuple[np.ndarray, np.ndarray]] = []  # (cells, indices)
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def nbytes(self) -> int:
+        return sum(cells.nbytes + indices.nbytes for cells, indices in self._runs)
+
+    def _cell_coordinate(self, values: np.ndarray) -> np.ndarray:
+        scaled = (np.asarray(values, dtype=np.float64) + 1.0) * (self.resolution / 2)
+        return np.clip(scaled, 0, self.resolution - 1).astype(np.int32)
+
+    def add(self, batch: PointBatch, start: int):
+        # start is the store index of the first point in batch
+        if len(batch) == 0:
+            return
+        cells = self._cell_coordinate(batch.y) * self.resolution + self._cell_coordinate(batch.x)
+        order = np.argsort(cells, kind='stable')
+        # Built on a copy and swapped in, so a query on another thread sees
+        # the runs before or after the add, never a merge half done
+        runs = self._runs + [(cells[order], order.astype(np.int64) + start)]
+        while len(runs) > 1 and len(runs[-2][0]) < 2 * len(runs[-1][0]):
+            newer_cells, newer_indices = runs.pop()
+            older_cells, older_indices = runs.pop()
+            cells = np.concatenate([older_cells, newer_cells])
+            # Both halves are sorted, which the stable sort exploits
+            order = np.argsort(cells, kind='stable')
+            runs.append((cells[order], np.concatenate([older_indices, newer_indices])[order]))
+        self._runs = runs
+        self.count = max(self.count, start + len(batch))
+
+    def query(self, x0: float, y0: float, x1: float, y1: float, limit: Optional[int] = None) -> np.ndarray:
+        # Store indices of every point in the cells overlapping the rectangle;
+        # points near its edges may lie just outside it. With a limit, every
+        # step-th of them instead, so a wide view never gathers them all.
+        column0, column1 = self._cell_coordinate([x0, x1])
+        row0, row1 = self._cell_coordinate([y0, y1])
+        row_starts = np.arange(row0, row1 + 1, dtype=np.int64) * self.resolution
+        ranges = []
+        for cells, indices in self._runs:
+            lows = np.searchsorted(cells, row_starts + column0, side='left')
+            highs = np.searchsorted(cells, row_starts + column1, side='right')
+            ranges.extend((indices, low, high) for low, high in zip(lows.tolist(), highs.tolist()) if high > low)
+        total = sum(high - low for _, low, high in ranges)
+        step = 1 if limit is None or total <= limit else -(-total // limit)
+        parts = []
+        position = 0  # of the range start among all matches, so the stride runs on across ranges
+        for indices, low, high in ranges:
+            parts.append(indices[low + (-position) % step:high:step])
+            position += high - low
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(parts)
@@ -0,0 +1,203 @@
+"""Headless batch runner: drives src.core only and never imports Qt, except
+to render --export-image on the offscreen platform"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List, Optional
+
+from .core.monte_carlo import MonteCarloSimulator, BIT_GENERATORS, SAMPLERS
+from .core.parallel import ParallelMonteCarloSimulator
+from .core.checkpoint import save_checkpoint, load_checkpoint, check_checkpoint_path
+from .utils.memory import MemoryReport, process_rss
+
+
+def count_argument(value: str) -> int:
+    # Accepts 1e9 style counts
+    count = int(float(value))
+    if count <= 0:
+        raise argparse.ArgumentTypeError(f"expected a positive count, got {value}")
+    return count
+
+
+def precision_argument(value: str) -> float:
+    precision = float(value)
+    if precision <= 0:
+        raise argparse.ArgumentTypeError(f"expected a positive half-width, got {value}")
+    return precision
+
+
+def confidence_argument(value: str) -> float:
+    confidence = float(value)
+    if not 0 < confidence < 1:
+        raise argparse.ArgumentTypeError(f"expected a confidence between 0 and 1, got {value}")
+    return confidence
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="main.py --headless",
+        description="Run the Monte Carlo π estimator without a display. "
+                    "Progress and results are written to stdout as JSON lines."
+    )
+    parser.add_argument("--points", type=count_argument, default=10_000_000,
+                        help="points to sample in this run (e.g. 1e9); an upper bound with --target-precision")
+    parser.add_argument("--batch", type=count_argument, default=1_000_000,
+                        help="points per add_points call")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--bit-generator", choices=list(BIT_GENERATORS), default="PCG64")
+    parser.add_argument("--sampler", choices=list(SAMPLERS), default="uniform")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes; more than 1 uses the parallel engine")
+    parser.add_argument("--store-points", action="store_true",
+                        help="keep every sample in memory instead of counts only")
+    parser.add_argument("--target-precision", type=precision_argument, metavar="EPS",
+                        help="stop once the confidence interval half-width is at most EPS")
+    parser.add_argument("--confidence", type=confidence_argument, default=0.95,
+                        help="confidence level of the reported interval")
+    parser.add_argument("--progress-interval", type=float, default=1.0,
+                        help="seconds between progress lines")
+    parser.add_argument("--json", metavar="PATH", help="also write the final result to this file")
+    parser.add_argument("--resume", metavar="PATH", help="continue from a checkpoint directory")
+    parser.add_argument("--checkpoint", metavar="PATH", help="save a checkpoint when the run ends")
+    parser.add_argument("--export-image", metavar="PATH",
+                        help="render every stored point into a PNG (needs --store-points; uses Qt offscreen)")
+    parser.add_argument("--export-size", type=count_argument, default=16384,
+                        help="exported image width and height in pixels")
+    return parser
+
+
+def create_simulator(args) -> MonteCarloSimulator:
+    if args.resume:
+        return load_checkpoint(args.resume)
+    if args.workers > 1:
+        return ParallelMonteCarloSimulator(workers=args.workers, seed=args.seed,
+                                           bit_generator=args.bit_generator, sampler=args.sampler)
+    return MonteCarloSimulator(store_points=args.store_points, seed=args.seed,
+                               bit_generator=args.bit_generator, sampler=args.sampler)
+
+
+def emit(record: dict):
+    sys.stdout.write(json.dumps(record) + "\n")
+    sys.stdout.flush()
+
+
+def progress_record(event: str, simulator: MonteCarloSimulator, sampled: int, elapsed: float,
+                    confidence: float = 0.95) -> dict:
+    pi_estimate = simulator.get_current_estimate()
+    ci_low, ci_high = simulator.get_confidence_interval(confidence)
+    # Tracked buffers next to RSS, to spot memory growth in long runs
+    memory = MemoryReport(rss=process_rss())
+    memory.add("simulator", simulator.memory_usage())
+    return {
+        "event": event,
+        "total_points": simulator.total_points,
+        "points_inside": simulator.points_inside,
+        "pi_estimate": pi_estimate,
+        "error": abs(pi_estimate - 3.141592653589793),
+        "points_this_run": sampled,
+        "elapsed": elapsed,
+        "points_per_second": sampled / elapsed if elapsed > 0 else 0.0,
+        "confidence": confidence,
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+        "ci_half_width": (ci_high - ci_low) / 2,
+        "memory": memory.to_dict(),
+    }
+
+
+def export_image(simulator: MonteCarloSimulator, path: str, size: int):
+    # Qt is only loaded for this; the offscreen platform needs no display
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtGui import QGuiApplication
+    from .ui.image_export import export_image as render
+
+    app = QGuiApplication.instance() or QGuiApplication([sys.argv[0]])
+    render(simulator, path, size,
+           progress=lambda done, total: emit({"event": "export", "strips_done": done, "strips": total}))
+    emit({"event": "exported", "path": str(path), "size": size})
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    # Incompatible options are rejected before any sampling starts
+    if args.store_points and args.workers > 1:
+        print("Error: --store-points needs --workers 1; the parallel engine keeps counts only", file=sys.stderr)
+        return 2
+    if args.checkpoint:
+        try:
+            check_checkpoint_path(args.checkpoint)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+    if args.export_image and not (args.store_points or args.resume):
+        print("Error: --export-image needs --store-points (or a checkpoint with stored points)", file=sys.stderr)
+        return 2
+
+    try:
+        simulator = create_simulator(args)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    if args.export_image and not simulator.store_points:
+        print(f"Error: --export-image needs stored points; the checkpoint's {simulator.engine} engine "
+              f"keeps counts only", file=sys.stderr)
+        simulator.shutdown()
+        return 2
+
+    emit({"event": "start", "points": args.points, "batch": args.batch,
+          "engine": simulator.engine, **simulator.get_settings()})
+
+    start_time = time.perf_counter()
+    last_progress = start_time
+    sampled = 0
+    interrupted = False
+    target_reached = False
+    try:
+        while sampled < args.points:
+            result = simulator.add_points(min(args.batch, args.points - sampled))
+            if args.target_precision is not None and sampled == 0:
+                # Planned from the throughput of the first batch
+                plan = simulator.plan_precision(args.target_precision, args.confidence)
+                emit({"event": "plan", "target_precision": plan.target_half_width,
+                      "confidence": plan.confidence, "points_needed": plan.points_needed,
+                      "points_remaining": plan.points_remaining, "seconds_remaining": plan.seconds_remaining})
+            sampled += result.batch_size
+
+            if args.target_precision is not None and simulator.precision_reached(args.target_precision,
+                                                                                 args.confidence):
+                target_reached = True
+                break
+
+            now = time.perf_counter()
+            if now - last_progress >= args.progress_interval:
+                emit(progress_record("progress", simulator, sampled, now - start_time, args.confidence))
+                last_progress = now
+    except KeyboardInterrupt:
+        interrupted = True
+    finally:
+        simulator.shutdown()
+
+    record = progress_record("result", simulator, sampled, time.perf_counter() - start_time, args.confidence)
+    record["interrupted"] = interrupted
+    if args.target_precision is not None:
+        record["target_precision"] = args.target_precision
+        record["target_reached"] = target_reached
+    record["statistics"] = simulator.get_statistics()
+    emit(record)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(record, f, indent=2)
+    if args.checkpoint:
+        save_checkpoint(simulator, args.checkpoint)
+    if args.export_image:
+        try:
+            export_image(simulator, args.export_image, args.export_size)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+
+    return 130 if interrupted else 0
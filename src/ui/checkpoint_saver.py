@@ -0,0 +1,23 @@
+from PySide6.QtCore import QThread, Signal
+from pathlib import Path
+
+from ..core.checkpoint import save_checkpoint
+from ..core.monte_carlo import SimulatorSnapshot
+
+
+class CheckpointSaver(QThread):
+    # Writes a snapshot taken on the GUI thread without blocking it
+    saved = Signal(str)
+    failed = Signal(str)
+
+    def __init__(self, snapshot: SimulatorSnapshot, path: Path):
+        super().__init__()
+        self.snapshot = snapshot
+        self.path = Path(path)
+
+    def run(self):
+        try:
+            save_checkpoint(self.snapshot, self.path)
+            self.saved.emit(str(self.path))
+        except Exception as e:
+            self.failed.emit(str(e))
@@ -0,0 +1,41 @@
+from PySide6.QtCore import QThread, Signal
+from typing import List
+import threading
+
+from ..core.density import DensityGrid
+from ..core.point_store import PointBatch
+
+
+class DensityLoader(QThread):
+    # Bins stored points (e.g. a memory-mapped checkpoint) into a density
+    # grid off the GUI thread, chunk by chunk, so opening a large run neither
+    # freezes the UI nor holds more than one chunk in memory
+    progress = Signal(int, int)
+    loaded = Signal(object)  # DensityGrid
+    failed = Signal(str)
+
+    def __init__(self, segments: List[PointBatch], resolution: int, chunk_size: int = 1 << 20):
+        super().__init__()
+        self.segments = segments
+        self.resolution = resolution
+        self.chunk_size = chunk_size
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def run(self):
+        try:
+            density = DensityGrid(self.resolution)
+            total = sum(len(segment) for segment in self.segments)
+            for segment in self.segments:
+                for start in range(0, len(segment), self.chunk_size):
+                    if self._cancel_event.is_set():
+                        return
+                    end = start + self.chunk_size
+                    density.add(PointBatch(segment.x[start:end], segment.y[start:end],
+                                           segment.inside[start:end]))
+                    self.progress.emit(density.total, total)
+            self.loaded.emit(density)
+        except Exception as e:
+            self.failed.emit(str(e))
@@ -0,0 +1,119 @@
+from PySide6.QtCore import Qt, QThread, QRectF, Signal
+from PySide6.QtGui import QImage, QPainter, QPen
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional, Union
+import os
+import numpy as np
+
+from .widgets.simulation_canvas import render_point_sprite, draw_sprites
+from ..core.monte_carlo import MonteCarloSimulator
+from ..core.point_store import PointBatch, PointStore
+from ..utils.colors import Colors
+from ..utils.png_writer import PNGWriter
+
+
+def export_image(source: Union[MonteCarloSimulator, PointStore], path, size: int = 16384,
+                 point_size: float = 2.0, strip_height: int = 512, chunk_size: int = 1 << 20,
+                 workers: Optional[int] = None,
+                 progress: Optional[Callable[[int, int], None]] = None) -> Path:
+    # Renders every stored point into a size x size PNG. The image is built
+    # in horizontal strips that are streamed to the PNG writer in order, and
+    # each strip scans the store chunk by chunk, so memory is bounded by
+    # `workers` strips plus one chunk mask no matter how large the run is.
+    # Strips render on a thread pool; QPainter on separate QImages is
+    # thread-safe and the heavy calls release the GIL.
+    store = source.store if isinstance(source, MonteCarloSimulator) else source
+    if isinstance(source, MonteCarloSimulator) and not source.store_points:
+        raise ValueError(f"The {source.engine} engine does not keep points; nothing to export")
+    # Views of the current buffers; points added while exporting are ignored
+    segments = store.segments()
+
+    path = Path(path)
+    workers = workers or os.cpu_count() or 1
+    margin = max(2, size // 100)
+    radius = (size - 2 * margin) / 2
+    center = size / 2
+    line_width = max(1.0, size / 400)
+
+    sprites = {
+        True: render_point_sprite(Colors.POINT_INSIDE, point_size),
+        False: render_point_sprite(Colors.POINT_OUTSIDE, point_size),
+    }
+
+    def chunks():
+        for segment in segments:
+            for start in range(0, len(segment), chunk_size):
+                end = start + chunk_size
+                yield PointBatch(segment.x[start:end], segment.y[start:end], segment.inside[start:end])
+
+    def render_strip(top: int) -> np.ndarray:
+        height = min(strip_height, size - top)
+        image = QImage(size, height, QImage.Format_RGB32)
+        image.fill(Colors.CANVAS_BACKGROUND)
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.translate(0, -top)
+
+        # Points whose sprite reaches into this strip
+        reach = point_size / 2 + 1
+        low_y = (center - (top + height + reach)) / radius
+        high_y = (center - (top - reach)) / radius
+        for chunk in chunks():
+            in_strip = (chunk.y >= low_y) & (chunk.y <= high_y)
+            if not in_strip.any():
+                continue
+            x = center + chunk.x[in_strip] * radius
+            y = center - chunk.y[in_strip] * radius
+            inside = chunk.inside[in_strip]
+            draw_sprites(painter, x[inside], y[inside], sprites[True])
+            draw_sprites(painter, x[~inside], y[~inside], sprites[False])
+
+        square = QRectF(center - radius, center - radius, 2 * radius, 2 * radius)
+        painter.setBrush(Qt.NoBrush)
+        painter.setPen(QPen(Colors.SQUARE_OUTLINE, line_width))
+        painter.drawRect(square)
+        painter.setPen(QPen(Colors.CIRCLE_OUTLINE, line_width))
+        painter.drawEllipse(square)
+        painter.end()
+
+        rgb = image.convertToFormat(QImage.Format_RGB888)
+        rows = np.frombuffer(rgb.constBits(), dtype=np.uint8).reshape(height, rgb.bytesPerLine())
+        return rows[:, :size * 3].reshape(height, size, 3).copy()
+
+    tops = list(range(0, size, strip_height))
+    with PNGWriter(path, size, size) as writer, ThreadPoolExecutor(max_workers=workers) as executor:
+        # Keep at most `workers` strips in flight so memory stays bounded
+        pending: List = []
+        next_strip = 0
+        for done in range(len(tops)):
+            while next_strip < len(tops) and len(pending) < workers:
+                pending.append(executor.submit(render_strip, tops[next_strip]))
+                next_strip += 1
+            writer.write_rows(pending.pop(0).result())
+            if progress is not None:
+                progress(done + 1, len(tops))
+    return path
+
+
+class ImageExporter(QThread):
+    # Runs export_image without blocking the GUI thread
+    progress = Signal(int, int)
+    exported = Signal(str)
+    failed = Signal(str)
+
+    def __init__(self, simulator: MonteCarloSimulator, path: Path, size: int, point_size: float = 2.0):
+        super().__init__()
+        self.simulator = simulator
+        self.path = Path(path)
+        self.size = size
+        self.point_size = point_size
+
+    def run(self):
+        try:
+            export_image(self.simulator, self.path, self.size, point_size=self.point_size,
+                         progress=self.progress.emit)
+            self.exported.emit(str(self.path))
+        except Exception as e:
+            self.failed.emit(str(e))
@@ -0,0 +1,29 @@
+from PySide6.QtCore import QThread, Signal
+import threading
+
+from .simulation_worker import SimulationWorker
+
+
+class IndexLoader(QThread):
+    # Catches the worker's spatial index up with points stored before it ran
+    # (e.g. a memory-mapped checkpoint) off the GUI thread, one chunk at a
+    # time, so zooming in never waits for a whole run to be indexed
+    progress = Signal(int, int)  # points indexed, points stored
+    failed = Signal(str)
+
+    def __init__(self, worker: SimulationWorker):
+        super().__init__()
+        self.worker = worker
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def run(self):
+        try:
+            while not self._cancel_event.is_set():
+                if not self.worker.index_chunk():
+                    return
+                self.progress.emit(self.worker.spatial_index.count, len(self.worker.simulator.store))
+        except Exception as e:
+            self.failed.emit(str(e))
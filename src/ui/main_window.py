@@ -1,23 +1,51 @@
 from PySide6.QtWidgets import (QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, 
-                             QSplitter, QStatusBar, QMenuBar, QMenu)
-from PySide6.QtCore import Qt, QTimer, Signal
-from PySide6.QtGui import QAction, QIcon
+                             QSplitter, QStatusBar, QMenuBar, QMenu, QFileDialog,
+                             QMessageBox, QInputDialog)
+from PySide6.QtCore import Qt, QTimer, Signal, QStandardPaths
+from PySide6.QtGui import QAction, QActionGroup, QIcon
+from pathlib import Path
+import time
 
 from .widgets.simulation_canvas import SimulationCanvas
 from .widgets.control_panel import ControlPanel
 from .widgets.statistics_panel import StatisticsPanel
+from .simulation_worker import SimulationWorker
+from .checkpoint_saver import CheckpointSaver
+from .image_export import ImageExporter
+from .density_loader import DensityLoader
+from .index_loader import IndexLoader
 from ..core.monte_carlo import MonteCarloSimulator
+from ..core.parallel import ParallelMonteCarloSimulator
+from ..core.checkpoint import save_checkpoint, load_checkpoint
 from ..utils.colors import Colors, Styles
+from ..utils.memory import MemoryReport, process_rss
+from ..utils.tracing import traced, tracer
 
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.simulator = MonteCarloSimulator()
+        self.recent_window = 100  # batches covered by the recent (EWMA) statistics
+        # Points kept for zooming and export (~17 B each plus 12 B of index);
+        # past this the run goes on counting and the density view covers it
+        self.max_stored_points = 20_000_000
+        self.simulator = MonteCarloSimulator(recent_window=self.recent_window,
+                                             max_stored_points=self.max_stored_points)
+        self.worker = SimulationWorker(self.simulator)
         self.simulation_timer = QTimer()
         self.is_running = False
         self.points_per_batch = 42
         self.simulation_speed = 100
+        self.display_interval = 33  # UI samples the worker at ~30 FPS
+        
+        self.autosave_timer = QTimer()
+        self.autosave_interval = 60000
+        self.autosave_path = Path(QStandardPaths.writableLocation(
+            QStandardPaths.AppDataLocation)) / "autosave.mcckpt"
+        self.checkpoint_saver = None
+        self.image_exporter = None
+        self.density_loader = None
+        self.index_loader = None
         
         self.setup_ui()
         self.setup_connections()
@@ -38,6 +66,30 @@ class MainWindow(QMainWindow):
         
         file_menu = menubar.addMenu('File')
         
+        save_action = QAction('Save Checkpoint...', self)
+        save_action.setShortcut('Ctrl+S')
+        save_action.triggered.connect(self.save_checkpoint_as)
+        file_menu.addAction(save_action)
+        
+        open_action = QAction('Open Checkpoint...', self)
+        open_action.setShortcut('Ctrl+O')
+        open_action.triggered.connect(self.open_checkpoint)
+        file_menu.addAction(open_action)
+        
+        self.autosave_action = QAction('Autosave', self)
+        self.autosave_action.setCheckable(True)
+        self.autosave_action.setToolTip(f"Save a checkpoint every {self.autosave_interval // 1000} s")
+        self.autosave_action.toggled.connect(self.set_autosave_enabled)
+        file_menu.addAction(self.autosave_action)
+        
+        export_action = QAction('Export Image...', self)
+        export_action.setShortcut('Ctrl+E')
+        export_action.setToolTip("Render every stored point into a large PNG")
+        export_action.triggered.connect(self.export_image)
+        file_menu.addAction(export_action)
+        
+        file_menu.addSeparator()
+        
         quit_action = QAction('Exit', self)
         quit_action.setShortcut('Ctrl+Q')
         quit_action.triggered.connect(self.close)
@@ -50,6 +102,12 @@ class MainWindow(QMainWindow):
         reset_action.triggered.connect(self.reset_simulation)
         sim_menu.addAction(reset_action)
         
+        self.parallel_action = QAction('Use All CPU Cores', self)
+        self.parallel_action.setCheckable(True)
+        self.parallel_action.setToolTip("Shard sampling across a process pool (counts only)")
+        self.parallel_action.toggled.connect(self.set_parallel_enabled)
+        sim_menu.addAction(self.parallel_action)
+        
         view_menu = menubar.addMenu('View')
         
         toggle_stats_action = QAction('Toggle Statistics Panel', self)
@@ -57,6 +115,56 @@ class MainWindow(QMainWindow):
         toggle_stats_action.triggered.connect(self.toggle_statistics_panel)
         view_menu.addAction(toggle_stats_action)
         
+        render_menu = view_menu.addMenu('Canvas Detail')
+        render_group = QActionGroup(self)
+        for mode, label in (('auto', 'Automatic'), ('points', 'Individual Points'), ('density', 'Density Heatmap')):
+            action = QAction(label, self)
+            action.setCheckable(True)
+            action.setChecked(mode == 'auto')
+            action.triggered.connect(lambda checked, mode=mode: self.canvas.set_render_mode(mode))
+            render_group.addAction(action)
+            render_menu.addAction(action)
+        
+        sample_menu = view_menu.addMenu('Displayed Points')
+        sample_group = QActionGroup(self)
+        for mode, label in (('uniform', 'Uniform Sample of Run'), ('recent', 'Most Recent')):
+            action = QAction(label, self)
+            action.setCheckable(True)
+            action.setChecked(mode == 'uniform')
+            action.triggered.connect(lambda checked, mode=mode: self.canvas.set_display_mode(mode))
+            sample_group.addAction(action)
+            sample_menu.addAction(action)
+        
+        refresh_menu = view_menu.addMenu('Statistics Refresh Rate')
+        refresh_group = QActionGroup(self)
+        for rate in (2, 10, 30):
+            action = QAction(f'{rate} Hz', self)
+            action.setCheckable(True)
+            action.setChecked(rate == 10)
+            action.triggered.connect(lambda checked, rate=rate: self.statistics_panel.set_refresh_rate(rate))
+            refresh_group.addAction(action)
+            refresh_menu.addAction(action)
+        
+        reset_view_action = QAction('Reset Zoom', self)
+        reset_view_action.setShortcut('Ctrl+0')
+        reset_view_action.setToolTip("Show the whole square again (or double-click the canvas)")
+        reset_view_action.triggered.connect(lambda: self.canvas.reset_view())
+        view_menu.addAction(reset_view_action)
+        
+        view_menu.addSeparator()
+        
+        self.trace_action = QAction('Record Trace', self)
+        self.trace_action.setCheckable(True)
+        self.trace_action.setChecked(tracer.enabled)
+        self.trace_action.setToolTip(f"Record timing spans of the hot paths (last {tracer.capacity:,} kept)")
+        self.trace_action.toggled.connect(self.set_tracing_enabled)
+        view_menu.addAction(self.trace_action)
+        
+        export_trace_action = QAction('Export Trace...', self)
+        export_trace_action.setToolTip("Save the recorded spans for chrome://tracing or Perfetto")
+        export_trace_action.triggered.connect(self.export_trace)
+        view_menu.addAction(export_trace_action)
+        
     def create_central_widget(self):
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -68,6 +176,7 @@ class MainWindow(QMainWindow):
         left_layout.setContentsMargins(5, 5, 5, 5)
         
         self.canvas = SimulationCanvas()
+        self.canvas.set_point_source(self.worker.visible_points)
         left_layout.addWidget(self.canvas, stretch=1)
         
         self.control_panel = ControlPanel()
@@ -76,6 +185,8 @@ class MainWindow(QMainWindow):
         main_splitter.addWidget(left_widget)
         
         self.statistics_panel = StatisticsPanel()
+        self.statistics_panel.set_simulator_lock(self.worker.locked)
+        self.statistics_panel.set_memory_source(self.memory_report)
         main_splitter.addWidget(self.statistics_panel)
         
         main_splitter.setSizes([900, 500])
@@ -97,63 +208,335 @@ class MainWindow(QMainWindow):
         self.control_panel.pause_simulation.connect(self.pause_simulation)
         self.control_panel.reset_simulation.connect(self.reset_simulation)
         self.control_panel.speed_changed.connect(self.set_simulation_speed)
+        self.control_panel.max_throughput_changed.connect(self.set_max_throughput)
+        self.control_panel.adaptive_batch_changed.connect(self.set_adaptive_batch)
+        self.control_panel.frame_budget_changed.connect(self.set_frame_budget)
+        self.control_panel.sampler_changed.connect(self.set_sampler)
+        self.control_panel.target_precision_changed.connect(self.set_target_precision)
+        self.worker.error_occurred.connect(self.on_worker_error)
+        self.worker.target_reached.connect(self.on_target_reached)
         
     def setup_timer(self):
-        self.simulation_timer.timeout.connect(self.simulation_step)
+        self.simulation_timer.timeout.connect(self.refresh_display)
+        self.autosave_timer.timeout.connect(self.autosave)
         
     def start_simulation(self):
         if not self.is_running:
             self.is_running = True
-            self.simulation_timer.start(self.simulation_speed)
+            self.worker.points_per_batch = self.points_per_batch
+            self.worker.set_interval(self.simulation_speed)
+            self.worker.start_worker()
+            self.update_display_interval()
+            self.simulation_timer.start()
             self.control_panel.set_running_state(True)
             self.status_bar.showMessage("Simulation in progress...")
             
     def pause_simulation(self):
         if self.is_running:
             self.is_running = False
+            self.worker.stop_worker()
             self.simulation_timer.stop()
+            self.refresh_display()
             self.control_panel.set_running_state(False)
             self.status_bar.showMessage("Simulation paused")
             
     def reset_simulation(self):
         self.pause_simulation()
+        self.cancel_density_loader()
+        self.cancel_index_loader()
+        self.worker.clear()
         self.simulator.reset()
         self.canvas.clear()
         self.statistics_panel.clear()
         self.control_panel.reset_display()
         self.status_bar.showMessage("Simulation reset")
         
-    def set_simulation_speed(self, speed_ms: int):
-        self.simulation_speed = speed_ms
-        if self.is_running:
-            self.simulation_timer.setInterval(self.simulation_speed)
+    def set_parallel_enabled(self, enabled: bool):
+        self.pause_simulation()
+        sampler = self.control_panel.current_sampler()
+        if enabled:
+            try:
+                simulator = ParallelMonteCarloSimulator(sampler=sampler, recent_window=self.recent_window)
+            except ValueError:
+                simulator = ParallelMonteCarloSimulator(recent_window=self.recent_window)
+        else:
+            simulator = MonteCarloSimulator(sampler=sampler, recent_window=self.recent_window,
+                                            max_stored_points=self.max_stored_points)
+        self.replace_simulator(simulator)
+        self.reset_simulation()
+        
+    def replace_simulator(self, simulator: MonteCarloSimulator):
+        self.cancel_density_loader()
+        self.cancel_index_loader()
+        self.simulator.shutdown()
+        if simulator.store_points and simulator.max_stored_points is None:
+            # e.g. a checkpoint saved by a headless run
+            simulator.set_max_stored_points(max(self.max_stored_points, len(simulator.store)))
+        self.simulator = simulator
+        self.worker.simulator = simulator
+        self.worker.clear()
+        # Zooming in shows stored points; counts-only engines keep the density view
+        self.canvas.set_point_source(self.worker.visible_points if simulator.store_points else None)
+        # The pool only pays off for batches it can split across every worker
+        if isinstance(simulator, ParallelMonteCarloSimulator):
+            self.worker.set_batch_limits(simulator.min_parallel_count, simulator.workers * simulator.shard_size)
+        else:
+            self.worker.set_batch_limits(1, 1 << 20)
+        
+        self.parallel_action.blockSignals(True)
+        self.parallel_action.setChecked(isinstance(simulator, ParallelMonteCarloSimulator))
+        self.parallel_action.blockSignals(False)
+        self.control_panel.set_sampler(simulator.sampler.name)
+        
+    def set_sampler(self, name: str):
+        try:
+            with self.worker.locked():
+                self.simulator.set_sampler(name)
+        except ValueError as e:
+            self.control_panel.set_sampler(self.simulator.sampler.name)
+            self.status_bar.showMessage(str(e))
+        
+    def save_checkpoint_as(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Checkpoint", "", "Monte Carlo checkpoint (*.mcckpt)"
+        )
+        if not path:
+            return
+        if not path.endswith(".mcckpt"):
+            path += ".mcckpt"
+        self.start_checkpoint_save(Path(path))
+        
+    def start_checkpoint_save(self, path: Path):
+        if self.checkpoint_saver is not None and self.checkpoint_saver.isRunning():
+            return
             
+        # Snapshotting is cheap; the write happens on the saver thread
+        with self.worker.locked():
+            snapshot = self.simulator.snapshot()
+            
+        self.checkpoint_saver = CheckpointSaver(snapshot, path)
+        self.checkpoint_saver.saved.connect(
+            lambda saved_path: self.status_bar.showMessage(f"Checkpoint saved to {saved_path}"))
+        self.checkpoint_saver.failed.connect(
+            lambda message: self.status_bar.showMessage(f"Checkpoint save failed: {message}"))
+        self.checkpoint_saver.start()
         
-    def simulation_step(self):
-        if not self.is_running:
-            return  # Don't process if simulation was paused
+    def open_checkpoint(self):
+        path = QFileDialog.getExistingDirectory(self, "Open Checkpoint")
+        if not path:
+            return
             
+        self.pause_simulation()
         try:
-            result = self.simulator.add_points(self.points_per_batch)
+            simulator = load_checkpoint(path)
+        except Exception as e:
+            QMessageBox.warning(self, "Open Checkpoint", f"Could not load checkpoint:\n\n{e}")
+            return
             
-            self.canvas.add_points(result.points)
+        self.replace_simulator(simulator)
+        # Only a bounded sample is read now; the density of the whole stored
+        # run is binned in the background and merged when it is ready
+        store = simulator.store
+        self.canvas.load_sample(store.sample(self.canvas.max_displayed_points, self.canvas.display_points.rng),
+                                len(store))
+        self.canvas.set_run_totals(simulator.points_inside, simulator.total_points)
+        if len(store) > 0:
+            self.start_density_loader(store.segments())
+            self.start_index_loader()
+        self.statistics_panel.clear()
+        self.statistics_panel.update_statistics(simulator.get_current_result(), simulator)
+        self.status_bar.showMessage(
+            f"Checkpoint loaded: {simulator.total_points:,} points | π ≈ {simulator.get_current_estimate():.6f}"
+        )
+        
+    def start_density_loader(self, segments):
+        loader = DensityLoader(segments, self.canvas.density.resolution)
+        loader.progress.connect(
+            lambda done, total: self.status_bar.showMessage(f"Binning stored points... {done:,}/{total:,}"))
+        loader.loaded.connect(lambda density: self.on_density_loaded(loader, density))
+        loader.failed.connect(
+            lambda message: self.status_bar.showMessage(f"Loading the stored density failed: {message}"))
+        self.density_loader = loader
+        loader.start()
+        
+    def on_density_loaded(self, loader: DensityLoader, density):
+        # A loader cancelled by a reset may still deliver; its run is gone
+        if loader is not self.density_loader:
+            return
+        self.density_loader = None
+        self.canvas.merge_density(density)
+        self.status_bar.showMessage(f"Density of {density.total:,} stored points loaded")
+        
+    def cancel_density_loader(self):
+        if self.density_loader is not None:
+            self.density_loader.cancel()
+            self.density_loader.wait()
+            self.density_loader = None
+            
+    def start_index_loader(self):
+        # Zooming in finds the stored points indexed so far; each chunk the
+        # loader adds redraws a zoomed view
+        loader = IndexLoader(self.worker)
+        loader.progress.connect(lambda indexed, stored: self.canvas.refresh_stored_points())
+        loader.failed.connect(
+            lambda message: self.status_bar.showMessage(f"Indexing the stored points failed: {message}"))
+        self.index_loader = loader
+        loader.start()
+        
+    def cancel_index_loader(self):
+        if self.index_loader is not None:
+            self.index_loader.cancel()
+            self.index_loader.wait()
+            self.index_loader = None
+            
+    def export_image(self):
+        if self.image_exporter is not None and self.image_exporter.isRunning():
+            self.status_bar.showMessage("An image export is already running")
+            return
+        if not self.simulator.store_points or len(self.simulator.store) == 0:
+            QMessageBox.information(self, "Export Image",
+                                    "There are no stored points to export. The parallel engine keeps counts only.")
+            return
+            
+        path, _ = QFileDialog.getSaveFileName(self, "Export Image", "", "PNG image (*.png)")
+        if not path:
+            return
+        if not path.endswith(".png"):
+            path += ".png"
+        size, ok = QInputDialog.getInt(self, "Export Image", "Image size (pixels per side):",
+                                       8192, 512, 32768, 1024)
+        if not ok:
+            return
+            
+        # The exporter reads views of the store, so sampling can continue
+        self.image_exporter = ImageExporter(self.simulator, Path(path), size)
+        self.image_exporter.progress.connect(
+            lambda done, total: self.status_bar.showMessage(f"Exporting image... {done}/{total} strips"))
+        self.image_exporter.exported.connect(
+            lambda exported_path: self.status_bar.showMessage(f"Image exported to {exported_path}"))
+        self.image_exporter.failed.connect(
+            lambda message: self.status_bar.showMessage(f"Image export failed: {message}"))
+        self.image_exporter.start()
+        
+    def set_tracing_enabled(self, enabled: bool):
+        if enabled:
+            tracer.enable()
+        else:
+            tracer.disable()
+            
+    def export_trace(self):
+        if len(tracer) == 0:
+            QMessageBox.information(self, "Export Trace",
+                                    "No spans recorded yet. Turn on View → Record Trace first.")
+            return
+            
+        path, _ = QFileDialog.getSaveFileName(self, "Export Trace", "", "Chrome trace (*.json)")
+        if not path:
+            return
+        if not path.endswith(".json"):
+            path += ".json"
+        try:
+            tracer.export(path)
+            self.status_bar.showMessage(f"Exported {len(tracer):,} spans to {path}")
+        except OSError as e:
+            self.status_bar.showMessage(f"Trace export failed: {e}")
+            
+    def set_autosave_enabled(self, enabled: bool):
+        if enabled:
+            self.autosave_path.parent.mkdir(parents=True, exist_ok=True)
+            self.autosave_timer.start(self.autosave_interval)
+        else:
+            self.autosave_timer.stop()
+            
+    def autosave(self):
+        if self.simulator.total_points > 0:
+            self.start_checkpoint_save(self.autosave_path)
+        
+    def set_simulation_speed(self, speed_ms: int):
+        self.simulation_speed = speed_ms
+        self.worker.set_interval(self.simulation_speed)
+        
+    def set_max_throughput(self, enabled: bool):
+        self.worker.set_max_throughput(enabled)
+        
+    def set_adaptive_batch(self, enabled: bool):
+        self.worker.set_adaptive_batch(enabled)
+        self.update_display_interval()
+        
+    def set_frame_budget(self, budget_ms: int):
+        self.worker.set_frame_budget(budget_ms)
+        self.update_display_interval()
+        
+    def update_display_interval(self):
+        # With adaptive batching one frame is one budget, so the display
+        # refreshes once per budget instead of at the fixed rate
+        if self.worker.adaptive_batch:
+            interval = int(self.worker.batch_controller.budget_ms)
+        else:
+            interval = self.display_interval
+        self.simulation_timer.setInterval(interval)
+        
+    @traced(category='ui')
+    def refresh_display(self):
+        # Runs on the GUI thread; the worker keeps sampling meanwhile
+        result, new_points, density = self.worker.take()
+        if result is None:
+            return
+            
+        try:
+            start_time = time.perf_counter()
+            self.canvas.set_run_totals(result.points_inside, result.total_points)
+            self.canvas.add_points(new_points, density)
+            paint_time = time.perf_counter() - start_time + self.canvas.last_paint_time
             
+            # Rate-limited; takes the worker lock itself when it redraws
+            start_time = time.perf_counter()
             self.statistics_panel.update_statistics(result, self.simulator)
+            stats_time = time.perf_counter() - start_time
+            
+            controller = self.worker.batch_controller
+            controller.record_paint(paint_time)
+            controller.record_stats(stats_time)
+            self.statistics_panel.update_frame_budget(
+                controller.breakdown() if self.worker.adaptive_batch else None)
             
             accuracy = max(0, (1.0 - result.error / 3.14159) * 100)
+            storage = ""
+            if self.simulator.store_full:
+                storage = f" | Storing stopped at {len(self.simulator.store):,} points (memory limit)"
             self.status_bar.showMessage(
                 f"Points: {result.total_points:,} | π ≈ {result.pi_estimate:.6f} | "
-                f"Accuracy: {accuracy:.2f}% | Running: {self.is_running}"
+                f"Accuracy: {accuracy:.2f}% | Running: {self.is_running}{storage}"
             )
             
-            if self.is_running and not self.simulation_timer.isActive():
-                print(f"Timer stopped unexpectedly at {result.total_points} points, restarting...")
-                self.simulation_timer.start(self.simulation_speed)
-            
         except Exception as e:
             print(f"Simulation error: {e}")
             self.status_bar.showMessage(f"Simulation error: {str(e)}")
             
+    def set_target_precision(self, half_width: float):
+        target = half_width if half_width > 0 else None
+        self.worker.set_target_precision(target)
+        self.statistics_panel.set_target_precision(target)
+        
+    def on_target_reached(self, half_width: float):
+        self.pause_simulation()
+        self.status_bar.showMessage(
+            f"Target precision reached: π ≈ {self.simulator.get_current_estimate():.6f} ± {half_width:.6f} "
+            f"({self.worker.confidence:.0%} CI) after {self.simulator.total_points:,} points"
+        )
+        
+    def memory_report(self) -> MemoryReport:
+        # Buffer sizes are plain attribute reads, so this needs no worker lock
+        report = MemoryReport(rss=process_rss())
+        report.add("simulator", self.simulator.memory_usage())
+        report.add("worker", self.worker.memory_usage())
+        report.add("canvas", self.canvas.memory_usage())
+        return report
+        
+    def on_worker_error(self, message: str):
+        self.pause_simulation()
+        self.status_bar.showMessage(f"Simulation error: {message}")
+            
     def toggle_statistics_panel(self):
         visible = self.statistics_panel.isVisible()
         self.statistics_panel.setVisible(not visible)
@@ -161,4 +544,14 @@ class MainWindow(QMainWindow):
         
     def closeEvent(self, event):
         self.pause_simulation()
+        self.autosave_timer.stop()
+        if self.checkpoint_saver is not None:
+            self.checkpoint_saver.wait()
+        if self.image_exporter is not None:
+            self.image_exporter.wait()
+        self.cancel_density_loader()
+        self.cancel_index_loader()
+        if self.autosave_action.isChecked() and self.simulator.total_points > 0:
+            save_checkpoint(self.simulator, self.autosave_path)
+        self.simulator.shutdown()
         event.accept()
\ No newline at end of file
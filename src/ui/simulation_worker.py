@@ -0,0 +1,232 @@
+from PySide6.QtCore import QThread, Signal
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+import threading
+import time
+
+from ..core.monte_carlo import MonteCarloSimulator, SimulationResult
+from ..core.point_store import PointBatch
+from ..core.density import DensityGrid
+from ..core.spatial_index import GridIndex
+from ..utils.frame_budget import FrameBudgetController
+from ..utils.tracing import span, tracer
+
+
+class SimulationWorker(QThread):
+    # Runs add_points off the GUI thread. Results are handed over through a
+    # queue of new point batches plus the latest result, which the UI drains
+    # with take() at display rate. Every published point is also binned into
+    # a density grid, so the density view sees batches the queue dropped.
+    # Stored points are indexed into a spatial grid in blocks, which the
+    # zoomed canvas queries for the points it can see.
+    error_occurred = Signal(str)
+    target_reached = Signal(float)  # CI half-width at the stop
+
+    def __init__(self, simulator: MonteCarloSimulator):
+        super().__init__()
+        self.simulator = simulator
+        self.points_per_batch = 42
+        self.min_batch_size = 1  # raised for engines that need large batches
+        self.interval_ms = 100
+        self.max_throughput = False
+        # When adaptive, each step is paced to one frame budget and the batch
+        # size comes from the controller instead of points_per_batch
+        self.adaptive_batch = False
+        self.batch_controller = FrameBudgetController(batch_size=self.points_per_batch)
+        self.max_pending_points = 10000
+        # Stop once the confidence interval is this narrow (None: run on)
+        self.target_half_width: Optional[float] = None
+        self.confidence = 0.95
+        self.density_resolution = 512
+        self.spatial_index = GridIndex()
+        self.index_block_size = 1 << 16
+        self.index_chunk_size = 1 << 20  # most points indexed per worker step
+        self._index_lock = threading.Lock()
+
+        # Guards the simulator; the UI takes it through locked()
+        self.lock = threading.Lock()
+        self._ui_waiting = threading.Event()
+
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._handoff_lock = threading.Lock()
+        self._pending: List[PointBatch] = []
+        self._pending_count = 0
+        self._latest: Optional[SimulationResult] = None
+        self._density = DensityGrid(self.density_resolution)
+        self._unbinned: List[PointBatch] = []
+        self._unbinned_count = 0
+
+    @contextmanager
+    def locked(self):
+        # Lets the UI in between batches even when the worker runs flat out
+        self._ui_waiting.set()
+        with self.lock:
+            self._ui_waiting.clear()
+            yield
+
+    def run(self):
+        tracer.name_thread('SimulationWorker')
+        while not self._stop_event.is_set():
+            while self._ui_waiting.is_set() and not self._stop_event.is_set():
+                time.sleep(0.0005)
+
+            adaptive = self.adaptive_batch
+            batch_size = self.batch_controller.batch_size if adaptive else self.points_per_batch
+            batch_size = max(batch_size, self.min_batch_size)
+            try:
+                start_time = time.perf_counter()
+                with self.lock:
+                    result = self.simulator.add_points(batch_size)
+                    target = self.target_half_width
+                    reached = target is not None and self.simulator.precision_reached(target, self.confidence)
+                compute_time = time.perf_counter() - start_time
+            except Exception as e:
+                self.error_occurred.emit(str(e))
+                break
+
+            with span('SimulationWorker.publish', 'worker'):
+                self._publish(result)
+                self._index_stored_points()
+            if reached:
+                low, high = self.simulator.get_confidence_interval(self.confidence)
+                self.target_reached.emit((high - low) / 2)
+                break
+
+            if adaptive:
+                self.batch_controller.record_compute(compute_time, result.batch_size)
+
+            if adaptive and not self.max_throughput:
+                self._wake_event.wait(max(0.0, self.batch_controller.budget_ms / 1000 - compute_time))
+                self._wake_event.clear()
+            elif not self.max_throughput:
+                self._wake_event.wait(self.interval_ms / 1000)
+                self._wake_event.clear()
+
+    def start_worker(self):
+        self._stop_event.clear()
+        self._wake_event.clear()
+        self.start()
+
+    def stop_worker(self):
+        self._stop_event.set()
+        self._wake_event.set()
+        self.simulator.cancel()
+        self.wait()
+
+    def set_interval(self, interval_ms: int):
+        self.interval_ms = interval_ms
+        self._wake_event.set()
+
+    def set_max_throughput(self, enabled: bool):
+        self.max_throughput = enabled
+        self._wake_event.set()
+
+    def set_target_precision(self, half_width: Optional[float]):
+        self.target_half_width = half_width
+
+    def set_adaptive_batch(self, enabled: bool):
+        if enabled and not self.adaptive_batch:
+            self.batch_controller.reset()
+        self.adaptive_batch = enabled
+        self._wake_event.set()
+
+    def set_batch_limits(self, min_batch_size: int, max_batch_size: int):
+        self.min_batch_size = max(1, min_batch_size)
+        self.batch_controller.min_batch_size = self.min_batch_size
+        self.batch_controller.max_batch_size = max(self.min_batch_size, max_batch_size)
+        self._wake_event.set()
+
+    def set_frame_budget(self, budget_ms: float):
+        self.batch_controller.set_budget(budget_ms)
+        self._wake_event.set()
+
+    def _publish(self, result: SimulationResult):
+        with self._handoff_lock:
+            self._latest = result
+            if len(result.points) > 0:
+                self._pending.append(result.points)
+                self._pending_count += len(result.points)
+                # Binned in blocks; per-batch binning would dominate small batches
+                self._unbinned.append(result.points)
+                self._unbinned_count += len(result.points)
+                if self._unbinned_count >= 8192:
+                    self._bin_unbinned()
+            # The canvas only keeps recent points, so drop the oldest batches
+            # if the UI falls behind
+            while self._pending_count > self.max_pending_points and len(self._pending) > 1:
+                self._pending_count -= len(self._pending.pop(0))
+
+    def take(self) -> Tuple[Optional[SimulationResult], PointBatch, DensityGrid]:
+        # The density grid holds only the points published since the last take
+        with self._handoff_lock:
+            self._bin_unbinned()
+            latest, pending, density = self._latest, self._pending, self._density
+            self._latest = None
+            self._pending = []
+            self._pending_count = 0
+            self._density = DensityGrid(self.density_resolution)
+        return latest, PointBatch.concatenate(pending).tail(self.max_pending_points), density
+
+    def _bin_unbinned(self):
+        self._density.add(PointBatch.concatenate(self._unbinned))
+        self._unbinned = []
+        self._unbinned_count = 0
+
+    def _index_stored_points(self):
+        # Whole blocks are indexed, at most one chunk per step so a resumed
+        # run's stored points are caught up on while sampling goes on
+        if len(self.simulator.store) - self.spatial_index.count >= self.index_block_size:
+            self.index_chunk(lambda: self.lock)
+
+    def index_chunk(self, lock=None) -> bool:
+        # Indexes the next chunk of stored points; False once none are left.
+        # The simulator lock is only held to take a bounded view of the store;
+        # binning, sorting and the occasional large run merge happen outside
+        # it, so they stall neither sampling nor the UI.
+        with self._index_lock:
+            with (lock or self.locked)():
+                store = self.simulator.store
+                if len(store) < self.spatial_index.count:
+                    self.spatial_index.clear()
+                start = self.spatial_index.count
+                block = store.slice(start, start + self.index_chunk_size)
+            if len(block) == 0:
+                return False
+            self.spatial_index.add(block, start)
+        return True
+
+    def visible_points(self, x0: float, y0: float, x1: float, y1: float,
+                       limit: Optional[int] = None) -> PointBatch:
+        # Stored points in the rectangle, evenly thinned to about limit. The
+        # index is caught up on by the worker or an IndexLoader, never on the
+        # caller's (GUI) thread; of the points it has not reached, only the
+        # last block is scanned directly, so a large backlog shows up as the
+        # loader works through it.
+        indices = self.spatial_index.query(x0, y0, x1, y1, limit)
+        with self.locked():
+            store = self.simulator.store
+            # A store reset since the query leaves indices past its end
+            candidates = store.take(indices[indices < len(store)])
+            start = max(self.spatial_index.count, len(store) - self.index_block_size)
+            candidates = PointBatch.concatenate([candidates, store.slice(start, len(store))])
+        visible = ((candidates.x >= x0) & (candidates.x <= x1) &
+                   (candidates.y >= y0) & (candidates.y <= y1))
+        batch = PointBatch(candidates.x[visible], candidates.y[visible], candidates.inside[visible])
+        if limit is not None and len(batch) > limit:
+            step = -(-len(batch) // limit)
+            batch = PointBatch(batch.x[::step], batch.y[::step], batch.inside[::step])
+        return batch
+
+    def memory_usage(self) -> Dict[str, int]:
+        # The index is read without its lock: a merge in progress only skews
+        # one reading. Queued batches are shared with the unbinned list.
+        with self._handoff_lock:
+            queued = {id(batch): batch for batch in self._pending + self._unbinned}
+            handoff = sum(batch.nbytes for batch in queued.values()) + self._density.nbytes
+        return {"spatial_index": self.spatial_index.nbytes, "handoff": handoff}
+
+    def clear(self):
+        self.take()
+        with self._index_lock:
+            self.spatial_index.clear()
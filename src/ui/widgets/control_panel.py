@@ -1,9 +1,10 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QSlider, QLabel, QSpinBox, QGroupBox, QCheckBox,
-                             QProgressBar, QFrame)
+                             QProgressBar, QFrame, QComboBox, QDoubleSpinBox)
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont
 import math
+from ...core.monte_carlo import SAMPLERS
 from ...utils.colors import Colors, Styles
 
 
@@ -13,6 +14,11 @@ class ControlPanel(QWidget):
     pause_simulation = Signal()
     reset_simulation = Signal()
     speed_changed = Signal(int)
+    max_throughput_changed = Signal(bool)
+    adaptive_batch_changed = Signal(bool)
+    frame_budget_changed = Signal(int)
+    sampler_changed = Signal(str)
+    target_precision_changed = Signal(float)  # 0 when disabled
     
     def __init__(self):
         super().__init__()
@@ -49,6 +55,9 @@ class ControlPanel(QWidget):
         # Speed control group
         self.create_speed_controls(layout)
         
+        # Sampling strategy group
+        self.create_sampling_controls(layout)
+        
         layout.addStretch()
         
         # Force layout update
@@ -136,17 +145,97 @@ class ControlPanel(QWidget):
         speed_layout.addWidget(self.speed_label)
         
         layout.addLayout(speed_layout)
+        
+        self.max_throughput_checkbox = QCheckBox("Max throughput")
+        self.max_throughput_checkbox.setStyleSheet("color: white; font-size: 12px;")
+        self.max_throughput_checkbox.setToolTip("Sample as fast as possible; the view refreshes at display rate")
+        layout.addWidget(self.max_throughput_checkbox)
+        
+        # Adaptive batch size
+        adaptive_layout = QHBoxLayout()
+        
+        self.adaptive_batch_checkbox = QCheckBox("Adaptive batch size")
+        self.adaptive_batch_checkbox.setStyleSheet("color: white; font-size: 12px;")
+        self.adaptive_batch_checkbox.setToolTip("Size each batch so sampling, painting and statistics fit the frame budget")
+        
+        budget_label = QLabel("Frame budget:")
+        budget_label.setStyleSheet(Styles.LABEL_STYLE)
+        
+        self.frame_budget_spin = QSpinBox()
+        self.frame_budget_spin.setRange(4, 100)
+        self.frame_budget_spin.setValue(16)
+        self.frame_budget_spin.setSuffix(" ms")
+        self.frame_budget_spin.setStyleSheet("color: white; background-color: #3a3a3f; padding: 2px;")
+        self.frame_budget_spin.setEnabled(False)
+        
+        adaptive_layout.addWidget(self.adaptive_batch_checkbox)
+        adaptive_layout.addStretch()
+        adaptive_layout.addWidget(budget_label)
+        adaptive_layout.addWidget(self.frame_budget_spin)
+        
+        layout.addLayout(adaptive_layout)
+        
         parent_layout.addWidget(group)
         
         
         
         
+    def create_sampling_controls(self, parent_layout):
+        group = QGroupBox("Sampling Strategy")
+        group.setStyleSheet("""
+        QGroupBox {
+            color: white; 
+            font-weight: bold; 
+            font-size: 12px;
+            border: 2px solid #555;
+            border-radius: 6px;
+            margin: 5px;
+        }
+        QGroupBox::title {
+            padding: 0 10px;
+        }
+        """)
+        layout = QHBoxLayout(group)
+        layout.setSpacing(10)
+        layout.setContentsMargins(15, 20, 15, 15)
+        
+        self.sampler_combo = QComboBox()
+        for name in SAMPLERS:
+            self.sampler_combo.addItem(name.replace('_', ' ').title(), name)
+        self.sampler_combo.setStyleSheet("color: white; background-color: #3a3a3f; padding: 4px;")
+        self.sampler_combo.setToolTip("How points are placed in the square")
+        
+        layout.addWidget(self.sampler_combo)
+        
+        # Stop automatically once the 95% CI is narrow enough
+        self.precision_checkbox = QCheckBox("Stop at CI ±")
+        self.precision_checkbox.setStyleSheet("color: white; font-size: 12px;")
+        self.precision_checkbox.setToolTip("Pause when the 95% confidence interval half-width reaches this value")
+        
+        self.precision_spin = QDoubleSpinBox()
+        self.precision_spin.setDecimals(5)
+        self.precision_spin.setRange(0.00001, 0.5)
+        self.precision_spin.setSingleStep(0.0001)
+        self.precision_spin.setValue(0.001)
+        self.precision_spin.setStyleSheet("color: white; background-color: #3a3a3f; padding: 2px;")
+        self.precision_spin.setEnabled(False)
+        
+        layout.addWidget(self.precision_checkbox)
+        layout.addWidget(self.precision_spin)
+        parent_layout.addWidget(group)
+        
     def setup_connections(self):
         self.start_btn.clicked.connect(self.on_start_clicked)
         self.pause_btn.clicked.connect(self.on_pause_clicked)
         self.reset_btn.clicked.connect(self.on_reset_clicked)
         
         self.speed_slider.valueChanged.connect(self.on_speed_changed)
+        self.max_throughput_checkbox.toggled.connect(self.on_max_throughput_toggled)
+        self.adaptive_batch_checkbox.toggled.connect(self.on_adaptive_batch_toggled)
+        self.frame_budget_spin.valueChanged.connect(self.frame_budget_changed.emit)
+        self.sampler_combo.currentIndexChanged.connect(self.on_sampler_changed)
+        self.precision_checkbox.toggled.connect(self.on_precision_changed)
+        self.precision_spin.valueChanged.connect(self.on_precision_changed)
         
     def on_start_clicked(self):
         self.start_simulation.emit()
@@ -161,6 +250,36 @@ class ControlPanel(QWidget):
         self.speed_label.setText(f"{value} ms")
         self.speed_changed.emit(value)
         
+    def on_max_throughput_toggled(self, checked):
+        self.update_speed_slider()
+        self.max_throughput_changed.emit(checked)
+        
+    def on_adaptive_batch_toggled(self, checked):
+        self.frame_budget_spin.setEnabled(checked)
+        self.update_speed_slider()
+        self.adaptive_batch_changed.emit(checked)
+        
+    def update_speed_slider(self):
+        # The delay only applies when neither mode paces the simulation
+        self.speed_slider.setEnabled(not self.max_throughput_checkbox.isChecked()
+                                     and not self.adaptive_batch_checkbox.isChecked())
+        
+    def on_precision_changed(self, *args):
+        enabled = self.precision_checkbox.isChecked()
+        self.precision_spin.setEnabled(enabled)
+        self.target_precision_changed.emit(self.precision_spin.value() if enabled else 0.0)
+        
+    def on_sampler_changed(self, index):
+        self.sampler_changed.emit(self.sampler_combo.itemData(index))
+        
+    def set_sampler(self, name: str):
+        self.sampler_combo.blockSignals(True)
+        self.sampler_combo.setCurrentIndex(self.sampler_combo.findData(name))
+        self.sampler_combo.blockSignals(False)
+        
+    def current_sampler(self) -> str:
+        return self.sampler_combo.currentData()
+        
     def set_running_state(self, running: bool):
         self.is_running = running
         self.start_btn.setEnabled(not running)
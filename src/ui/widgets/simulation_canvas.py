@@ -1,229 +1,556 @@
 from PySide6.QtWidgets import QWidget
-from PySide6.QtCore import Qt, QRectF, QTimer, QPropertyAnimation, QEasingCurve
-from PySide6.QtGui import QPainter, QPen, QBrush, QColor
+from PySide6.QtCore import Qt, QPointF, QRect, QRectF, QTimer, QPropertyAnimation, QEasingCurve
+from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QImage, QPixmap
 import math
-from typing import List
-from ...core.monte_carlo import Point
+import time
+import numpy as np
+import shiboken6
+from typing import Callable, Dict, Optional
+from ...core.monte_carlo import PointBatch
+from ...core.density import DensityGrid
+from ...core.reservoir import PointReservoir
 from ...utils.colors import Colors
+from ...utils.tracing import traced
 
 
-class AnimatedPoint:
-    def __init__(self, point: Point):
-        self.point = point
-        self.alpha = 0
-        self.scale = 0.0
-        self.target_alpha = 255
-        self.target_scale = 1.0
-        self.animation_progress = 0.0
-        
-    def update_animation(self, dt: float):
-        self.animation_progress = min(1.0, self.animation_progress + dt * 4.0)
-        
-        # Ease-out animation
-        progress = 1 - (1 - self.animation_progress) ** 2
-        
-        self.alpha = int(progress * self.target_alpha)
-        self.scale = progress * self.target_scale
+def render_point_sprite(color: QColor, diameter: float) -> QPixmap:
+    # Antialiased dot in device pixels, stamped by draw_sprites
+    extent = math.ceil(diameter + 2)
+    sprite = QPixmap(extent, extent)
+    sprite.fill(Qt.transparent)
+    painter = QPainter(sprite)
+    painter.setRenderHint(QPainter.Antialiasing, True)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(QBrush(color))
+    painter.drawEllipse(QRectF((extent - diameter) / 2, (extent - diameter) / 2, diameter, diameter))
+    painter.end()
+    return sprite
+
+
+def draw_sprites(painter: QPainter, x: np.ndarray, y: np.ndarray, sprite: QPixmap,
+                 scale: float = 1.0, opacity: float = 1.0):
+    # Stamps the sprite centred on every (x, y) with one drawPixmapFragments
+    # call. The fragment array is a NumPy buffer laid out like
+    # QPainter::PixmapFragment (x, y, source rect, scale, rotation, opacity),
+    # so no per-point Python objects exist.
+    count = len(x)
+    if count == 0:
+        return
+    fragments = np.empty((count, 10), dtype=np.float64)
+    fragments[:, 0] = x
+    fragments[:, 1] = y
+    fragments[:, 2:6] = (0, 0, sprite.width(), sprite.height())
+    fragments[:, 6:10] = (scale, scale, 0.0, opacity)
+    
+    first = shiboken6.wrapInstance(fragments.ctypes.data, QPainter.PixmapFragment)
+    painter.drawPixmapFragments(first, count, sprite)
+
+
+class PointAnimations:
+    # Fade/scale-in state of recently added points, kept as arrays so a frame
+    # advances every point in one vectorised step. Points are appended in
+    # order and all advance together, so progress never increases along the
+    # arrays and finished points always form a prefix.
+    def __init__(self, duration: float = 0.25, alpha_levels: int = 32):
+        self.duration = duration
+        self.alpha_levels = alpha_levels
+        self.clear()
+        
+    def __len__(self) -> int:
+        return len(self.progress)
+        
+    @property
+    def nbytes(self) -> int:
+        return self.points.nbytes + self.progress.nbytes
+        
+    def clear(self):
+        self.points = PointBatch.empty()
+        self.progress = np.empty(0, dtype=np.float64)
+        
+    def add(self, batch: PointBatch, limit: int):
+        self.points = PointBatch.concatenate([self.points, batch]).tail(limit)
+        progress = np.concatenate([self.progress, np.zeros(len(batch))])
+        self.progress = progress[len(progress) - len(self.points):]
+        
+    def advance(self, dt: float) -> PointBatch:
+        # Returns the points that finished during this step
+        self.progress = np.minimum(self.progress + dt / self.duration, 1.0)
+        finished = int(np.count_nonzero(self.progress >= 1.0))
+        done = self.points.head(finished)
+        self.points = self.points.tail(len(self.points) - finished)
+        self.progress = self.progress[finished:]
+        return done
+        
+    def take_all(self) -> PointBatch:
+        points = self.points
+        self.clear()
+        return points
+        
+    def groups(self):
+        # Yields (alpha, scale, batch) runs of points sharing a quantised
+        # ease-out level, so each run is drawn with a single brush
+        eased = 1 - (1 - self.progress) ** 2
+        levels = np.rint(eased * (self.alpha_levels - 1)).astype(np.intp)
+        bounds = np.concatenate([[0], np.flatnonzero(np.diff(levels)) + 1, [len(levels)]])
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            if end <= start:
+                continue
+            level = levels[start] / (self.alpha_levels - 1)
+            batch = PointBatch(self.points.x[start:end], self.points.y[start:end],
+                               self.points.inside[start:end])
+            yield int(level * 255), level, batch
 
 
 class SimulationCanvas(QWidget):
     def __init__(self):
         super().__init__()
-        self.animated_points: List[AnimatedPoint] = []
-        self.all_points: List[Point] = []
+        self.animations = PointAnimations()
         
         self.show_animations = True
         self.show_grid = False
         self.point_size = 4  # Increased for better visibility
         self.max_displayed_points = 100000  # Increased limit for more points
+        # Fixed-size sample of the run that the point view shows, either
+        # uniform over all points so far or the most recent ones
+        self.display_points = PointReservoir(self.max_displayed_points, mode='uniform')
+        self.point_sprites = {}
+        
+        # Settled points are accumulated on an offscreen image so a paint is
+        # a single blit. Points the sample drops cannot be erased from it, so
+        # it is rebuilt from the sample once a quarter of what it shows is
+        # stale, and on resize, point size or display mode change and clear.
+        self.points_layer = None
+        self.points_layer_dirty = True
+        self.max_stale_points = self.max_displayed_points // 4
+        self.layer_replaced = 0  # display_points.replaced when the layer was built
+        
+        # Level of detail: every point the canvas is given is binned into a
+        # fixed-size density grid, which replaces the point view once the run
+        # outgrows it (counts-only engines only hand over previews)
+        self.density = DensityGrid()
+        self.density_image = None
+        self.render_mode = 'auto'  # 'auto', 'points' or 'density'
+        self.density_threshold = self.max_displayed_points
+        
+        # Grid, square and circle only change on resize or grid toggle; the
+        # legend panel never changes apart from its counts
+        self.static_layer = None
+        self.legend_layer = None
+        # Exact (inside, total) counts of the run, set by the owner; the grid
+        # and the sample can cover fewer points (counts-only engines, loading)
+        self.run_totals = None
+        self.legend_rect = QRect(10, 10, 320, 120)
+        self.counts_rect = QRect(210, 90, 400, 30)  # counts can run past the panel
+        
+        # Zoomed viewport in data coordinates (x0, y0, x1, y1). While zoomed
+        # the layer shows the stored points in view, fetched through
+        # point_source(x0, y0, x1, y1, limit) instead of the display sample
+        self.view = (-1.0, -1.0, 1.0, 1.0)
+        self.min_view_width = 2e-4
+        self.point_source: Optional[Callable[[float, float, float, float, int], PointBatch]] = None
+        self.drag_start = None
         
         self.setMinimumSize(400, 400)
         self.setStyleSheet(f"background-color: {Colors.CANVAS_BACKGROUND.name()};")
         
-        # Animation timer
+        # Animation timer; only runs while points are animating
         self.animation_timer = QTimer()
+        self.animation_timer.setInterval(16)  # ~60 FPS
         self.animation_timer.timeout.connect(self.update_animations)
-        self.animation_timer.start(16)  # ~60 FPS
-        
-        self.last_time = 0
         
-    def add_points(self, new_points: List[Point]):
-        self.all_points.extend(new_points)
+        self.last_time = 0.0
+        self.last_paint_time = 0.0  # seconds spent in the latest paintEvent
         
-        # Keep only recent points for display to maintain performance
-        if len(self.all_points) > self.max_displayed_points:
-            self.all_points = self.all_points[-self.max_displayed_points:]
+    @traced(category='canvas')
+    def add_points(self, new_points: PointBatch, density: Optional[DensityGrid] = None):
+        # density carries the binned counts when the caller saw more points
+        # than it passes in (e.g. batches the worker queue dropped)
+        if density is not None:
+            self.density.merge(density)
+        else:
+            self.density.add(new_points)
+        self.density_image = None
+        
+        # Only points that enter the display sample are drawn. Points they
+        # replace stay on the accumulation layer until it is next rebuilt.
+        admitted = self.display_points.add(new_points)
+        if self.zoomed_to_points():
+            # The zoomed layer holds every stored point in view, not a sample
+            new_points = self.points_in_view(new_points)
+        else:
+            new_points = admitted
+            if self.display_points.replaced - self.layer_replaced > self.max_stale_points:
+                self.points_layer_dirty = True
+        
+        if self.showing_density():
+            # Rebuilt from the display sample if the view switches back
+            self.points_layer_dirty = True
+        elif self.show_animations:
+            self.animations.add(new_points, self.max_displayed_points)
+            if not self.animation_timer.isActive() and len(self.animations) > 0:
+                self.last_time = time.perf_counter()
+                self.animation_timer.start()
+        else:
+            self.draw_onto_layer(new_points)
         
-        if self.show_animations:
-            for point in new_points:
-                animated_point = AnimatedPoint(point)
-                self.animated_points.append(animated_point)
+        self.update(self.points_rect())
+        self.update(self.counts_rect)
         
-        self.update()
+    def set_run_totals(self, points_inside: int, total_points: int):
+        self.run_totals = (points_inside, total_points)
+        self.update(self.counts_rect)
         
     def clear(self):
-        self.animated_points.clear()
-        self.all_points.clear()
+        self.run_totals = None
+        self.animations.clear()
+        self.animation_timer.stop()
+        self.display_points.clear()
+        self.points_layer_dirty = True
+        self.density.clear()
+        self.density_image = None
         self.update()
         
+    def memory_usage(self) -> Dict[str, int]:
+        # Bytes held by the display sample, animation state, density grid
+        # and the cached images the paint path blits
+        images = [image for image in (self.points_layer, self.density_image) if image is not None]
+        pixmaps = [pixmap for pixmap in (self.static_layer, self.legend_layer, *self.point_sprites.values())
+                   if pixmap is not None]
+        return {
+            "display_sample": self.display_points.nbytes,
+            "animations": self.animations.nbytes,
+            "density": self.density.nbytes,
+            "layers": sum(image.sizeInBytes() for image in images) +
+                      sum(pixmap.width() * pixmap.height() * pixmap.depth() // 8 for pixmap in pixmaps),
+        }
+        
+    @traced(category='canvas')
     def update_animations(self):
-        current_time = self.animation_timer.remainingTime()
-        dt = 0.016  # Assume 60 FPS
+        current_time = time.perf_counter()
+        dt = min(current_time - self.last_time, 0.1)
+        self.last_time = current_time
         
-        # Update point animations
-        self.animated_points = [
-            p for p in self.animated_points 
-            if p.animation_progress < 1.0
-        ]
+        # Finished points move onto the accumulation layer
+        self.draw_onto_layer(self.animations.advance(dt))
         
-        for point in self.animated_points:
-            point.update_animation(dt)
-            
-        if self.animated_points:
-            self.update()
+        if len(self.animations) == 0:
+            self.animation_timer.stop()
+        self.update(self.points_rect())
             
     def set_animation_enabled(self, enabled: bool):
         self.show_animations = enabled
-        if not enabled:
-            self.animated_points.clear()
+        if not enabled and len(self.animations) > 0:
+            self.draw_onto_layer(self.animations.take_all())
+            self.animation_timer.stop()
+            self.update(self.points_rect())
             
     def set_grid_enabled(self, enabled: bool):
         self.show_grid = enabled
+        self.static_layer = None
         self.update()
         
     def set_point_size(self, size: int):
         self.point_size = max(1, min(10, size))
+        self.points_layer_dirty = True
         self.update()
         
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing, True)
+    def load_sample(self, sample: PointBatch, seen: int):
+        # Replaces the canvas contents with a uniform sample of a stored run,
+        # e.g. from a checkpoint; its density arrives later through merge_density
+        self.clear()
+        self.display_points.load(sample, seen)
+        
+    def merge_density(self, density: DensityGrid):
+        self.density.merge(density)
+        self.density_image = None
+        self.update()
+        
+    def set_display_mode(self, mode: str):
+        self.display_points.set_mode(mode)
+        self.points_layer_dirty = True
+        self.update(self.points_rect())
+        
+    def set_render_mode(self, mode: str):
+        if mode not in ('auto', 'points', 'density'):
+            raise ValueError(f"Unknown render mode '{mode}'")
+        self.render_mode = mode
+        self.update()
         
-        # Get canvas dimensions
-        width = self.width()
-        height = self.height()
-        size = min(width, height) - 20
-        center_x = width // 2
-        center_y = height // 2
+    def showing_density(self) -> bool:
+        if self.zoomed_to_points():
+            return False
+        if self.render_mode == 'auto':
+            return self.density.total > self.density_threshold
+        return self.render_mode == 'density'
+        
+    def set_point_source(self, source: Optional[Callable[[float, float, float, float, int], PointBatch]]):
+        self.point_source = source
+        self.points_layer_dirty = True
+        self.update()
+        
+    def refresh_stored_points(self):
+        # More stored points became reachable through point_source
+        if self.zoomed_to_points():
+            self.points_layer_dirty = True
+            self.update(self.points_rect())
+        
+    def is_zoomed(self) -> bool:
+        return self.view[2] - self.view[0] < 2.0
+        
+    def zoomed_to_points(self) -> bool:
+        return self.is_zoomed() and self.point_source is not None
+        
+    def set_view(self, center_x: float, center_y: float, width: float):
+        # Keeps the view square and inside [-1,1] x [-1,1]
+        width = min(2.0, max(self.min_view_width, width))
+        half = width / 2
+        center_x = min(max(center_x, -1.0 + half), 1.0 - half)
+        center_y = min(max(center_y, -1.0 + half), 1.0 - half)
+        view = (center_x - half, center_y - half, center_x + half, center_y + half)
+        if view == self.view:
+            return
+        self.view = view
+        self.points_layer_dirty = True
+        self.static_layer = None
+        self.update()
+        
+    def reset_view(self):
+        self.set_view(0.0, 0.0, 2.0)
+        
+    def zoom_at(self, factor: float, canvas_x: float, canvas_y: float):
+        # Scales the view by factor, keeping the data point under the cursor fixed
+        x0, y0, x1, y1 = self.view
+        anchor_x, anchor_y = self.canvas_to_data(canvas_x, canvas_y)
+        center_x = anchor_x + ((x0 + x1) / 2 - anchor_x) * factor
+        center_y = anchor_y + ((y0 + y1) / 2 - anchor_y) * factor
+        self.set_view(center_x, center_y, (x1 - x0) * factor)
+        
+    def points_in_view(self, batch: PointBatch) -> PointBatch:
+        x0, y0, x1, y1 = self.view
+        visible = (batch.x >= x0) & (batch.x <= x1) & (batch.y >= y0) & (batch.y <= y1)
+        return PointBatch(batch.x[visible], batch.y[visible], batch.inside[visible])
+        
+    def resizeEvent(self, event):
+        self.points_layer_dirty = True
+        self.static_layer = None
+        super().resizeEvent(event)
+        
+    def square_rect(self) -> QRectF:
+        size = min(self.width(), self.height()) - 20
         radius = size // 2
+        return QRectF(self.width() // 2 - radius, self.height() // 2 - radius, size, size)
+        
+    def points_rect(self) -> QRect:
+        # Everything a point can touch: the square plus half a point and the
+        # antialiasing fringe
+        margin = self.point_size + 2
+        return self.square_rect().toAlignedRect().adjusted(-margin, -margin, margin, margin)
+        
+    def viewport(self):
+        # Left, top and side length of the area the view maps onto
+        radius = (min(self.width(), self.height()) - 20) // 2
+        return self.width() // 2 - radius, self.height() // 2 - radius, 2 * radius
+        
+    def transform_point(self, x, y):
+        # Transform coordinates: view ([-1,1] unless zoomed) -> canvas coordinates
+        left, top, extent = self.viewport()
+        x0, y0, x1, y1 = self.view
+        scale = extent / (x1 - x0)
+        canvas_x = left + (x - x0) * scale
+        canvas_y = top + (y1 - y) * scale  # Flip Y axis
+        return canvas_x, canvas_y
+        
+    def canvas_to_data(self, canvas_x: float, canvas_y: float):
+        left, top, extent = self.viewport()
+        x0, y0, x1, y1 = self.view
+        scale = (x1 - x0) / max(1, extent)
+        return x0 + (canvas_x - left) * scale, y1 - (canvas_y - top) * scale
+        
+    def data_rect(self) -> QRectF:
+        # The [-1,1] square in canvas coordinates; larger than the widget when zoomed
+        left, top = self.transform_point(-1.0, 1.0)
+        right, bottom = self.transform_point(1.0, -1.0)
+        return QRectF(left, top, right - left, bottom - top)
+        
+    def ensure_points_layer(self):
+        if self.points_layer is not None and not self.points_layer_dirty:
+            return
+        
+        ratio = self.devicePixelRatioF()
+        self.points_layer = QImage(max(1, round(self.width() * ratio)),
+                                   max(1, round(self.height() * ratio)),
+                                   QImage.Format_ARGB32_Premultiplied)
+        self.points_layer.setDevicePixelRatio(ratio)
+        self.points_layer.fill(Qt.transparent)
+        self.points_layer_dirty = False
+        self.layer_replaced = self.display_points.replaced
+        
+        # The display sample includes points that are still fading in; they
+        # are briefly drawn both settled and animated
+        if self.zoomed_to_points():
+            # Thinned out evenly by the source, so a wide view costs what the sample does
+            batch = self.point_source(*self.view, self.max_displayed_points)
+        else:
+            batch = self.display_points.view()
+        self.draw_onto_layer(batch)
         
-        # Transform coordinates: [-1,1] -> canvas coordinates
-        def transform_point(x: float, y: float):
-            canvas_x = center_x + x * radius
-            canvas_y = center_y - y * radius  # Flip Y axis
-            return canvas_x, canvas_y
+    def draw_onto_layer(self, batch: PointBatch):
+        # A dirty layer is redrawn from the display sample on the next paint instead
+        if self.points_layer is None or self.points_layer_dirty or len(batch) == 0:
+            return
+        
+        painter = QPainter(self.points_layer)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        if self.is_zoomed():
+            batch = self.points_in_view(batch)
+            painter.setClipRect(self.square_rect())
+        self.draw_points(painter, batch)
+        painter.end()
+        
+    def create_layer(self, width: int, height: int) -> QPixmap:
+        ratio = self.devicePixelRatioF()
+        layer = QPixmap(max(1, round(width * ratio)), max(1, round(height * ratio)))
+        layer.setDevicePixelRatio(ratio)
+        layer.fill(Qt.transparent)
+        return layer
+        
+    def ensure_static_layer(self):
+        if self.static_layer is not None:
+            return
+        
+        self.static_layer = self.create_layer(self.width(), self.height())
+        painter = QPainter(self.static_layer)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        if self.is_zoomed():
+            painter.setClipRect(self.square_rect().adjusted(-1, -1, 1, 1))
         
         # Draw grid if enabled
         if self.show_grid:
-            self.draw_grid(painter, center_x, center_y, radius)
+            self.draw_grid(painter)
             
-        # Draw square boundary
+        # Draw square boundary; when zoomed, the viewport edge stands in for it
         pen = QPen(Colors.SQUARE_OUTLINE, 2)
         painter.setPen(pen)
         painter.setBrush(Qt.NoBrush)
-        square_rect = QRectF(center_x - radius, center_y - radius, size, size)
-        painter.drawRect(square_rect)
+        painter.drawRect(self.square_rect() if self.is_zoomed() else self.data_rect())
         
         # Draw circle
         pen = QPen(Colors.CIRCLE_OUTLINE, 2)
         painter.setPen(pen)
         painter.setBrush(Qt.NoBrush)
-        circle_rect = QRectF(center_x - radius, center_y - radius, size, size)
-        painter.drawEllipse(circle_rect)
+        painter.drawEllipse(self.data_rect())
+        painter.end()
         
-        # Draw points
-        self.draw_points(painter, transform_point)
+    @traced(category='canvas')
+    def paintEvent(self, event):
+        start_time = time.perf_counter()
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        
+        # Only the dirty region is repainted; Qt clips every blit to it
+        density_view = self.showing_density()
+        if density_view:
+            painter.save()
+            painter.setClipRect(self.square_rect())
+            self.draw_density(painter, self.data_rect())
+            painter.restore()
+        
+        self.ensure_static_layer()
+        painter.drawPixmap(0, 0, self.static_layer)
+        
+        if not density_view:
+            # Draw settled points from the accumulation layer
+            self.ensure_points_layer()
+            painter.drawImage(0, 0, self.points_layer)
+            
+            # Draw animated points on top, one brush per alpha level
+            painter.save()
+            if self.is_zoomed():
+                painter.setClipRect(self.square_rect())
+            for alpha, scale, batch in self.animations.groups():
+                if alpha > 0:
+                    self.draw_points(painter, batch, alpha, scale)
+            painter.restore()
         
         # Draw legend
-        self.draw_legend(painter)
+        if event.region().intersects(self.legend_rect) or event.region().intersects(self.counts_rect):
+            self.draw_legend(painter)
+        
+        painter.end()
+        self.last_paint_time = time.perf_counter() - start_time
         
-    def draw_grid(self, painter: QPainter, center_x: int, center_y: int, radius: int):
+    def draw_grid(self, painter: QPainter):
         pen = QPen(QColor(60, 60, 65), 1)
         painter.setPen(pen)
         
-        # Grid lines every 0.2 units
-        for i in range(-5, 6):
-            offset = i * 0.2 * radius
+        # Grid lines every 0.2 units, halving the spacing each time the view
+        # zooms in by 2x
+        x0, y0, x1, y1 = self.view
+        spacing = 0.2 * 2.0 ** math.floor(math.log2((x1 - x0) / 2))
+        square = self.square_rect()
+        for i in range(math.ceil(x0 / spacing), math.floor(x1 / spacing) + 1):
             # Vertical lines
-            painter.drawLine(center_x + offset, center_y - radius, 
-                           center_x + offset, center_y + radius)
+            canvas_x, _ = self.transform_point(i * spacing, 0.0)
+            painter.drawLine(QPointF(canvas_x, square.top()), QPointF(canvas_x, square.bottom()))
+        for i in range(math.ceil(y0 / spacing), math.floor(y1 / spacing) + 1):
             # Horizontal lines
-            painter.drawLine(center_x - radius, center_y + offset,
-                           center_x + radius, center_y + offset)
+            _, canvas_y = self.transform_point(0.0, i * spacing)
+            painter.drawLine(QPointF(square.left(), canvas_y), QPointF(square.right(), canvas_y))
                            
-    def draw_points(self, painter: QPainter, transform_func):
-        # Draw regular points (older points) using batch drawing for performance
-        displayed_points = self.all_points[-self.max_displayed_points:] if len(self.all_points) > self.max_displayed_points else self.all_points
-        animated_point_set = {id(ap.point) for ap in self.animated_points}
-        
-        # Separate points by type for batch drawing
-        inside_points = []
-        outside_points = []
-        
-        for point in displayed_points:
-            if id(point) not in animated_point_set:
-                canvas_x, canvas_y = transform_func(point.x, point.y)
-                if point.inside_circle:
-                    inside_points.append((canvas_x, canvas_y))
-                else:
-                    outside_points.append((canvas_x, canvas_y))
-        
-        # Batch draw inside points (green)
-        if inside_points:
-            painter.setPen(Qt.NoPen)
-            painter.setBrush(QBrush(Colors.POINT_INSIDE))
-            for x, y in inside_points:
-                painter.drawEllipse(x - self.point_size/2, y - self.point_size/2, 
-                                  self.point_size, self.point_size)
-        
-        # Batch draw outside points (red)
-        if outside_points:
-            painter.setPen(Qt.NoPen)
-            painter.setBrush(QBrush(Colors.POINT_OUTSIDE))
-            for x, y in outside_points:
-                painter.drawEllipse(x - self.point_size/2, y - self.point_size/2,
-                                  self.point_size, self.point_size)
-                
-        # Draw animated points on top (keep individual drawing for animations)
-        for animated_point in self.animated_points:
-            self.draw_single_point(
-                painter, 
-                animated_point.point, 
-                transform_func, 
-                animated_point.alpha,
-                animated_point.scale
+    def draw_density(self, painter: QPainter, target: QRectF):
+        if self.density_image is None:
+            rgba = self.density.to_rgba(
+                Colors.POINT_INSIDE.getRgb()[:3],
+                Colors.POINT_OUTSIDE.getRgb()[:3],
+                Colors.CANVAS_BACKGROUND.getRgb()[:3],
             )
+            resolution = self.density.resolution
+            self.density_image = QImage(rgba.data, resolution, resolution, resolution * 4,
+                                        QImage.Format_RGBA8888).copy()
+        
+        painter.save()
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+        painter.drawImage(target, self.density_image)
+        painter.restore()
+        
+    def point_sprite(self, base_color: QColor) -> QPixmap:
+        # Antialiased dot rendered once per colour, point size and pixel ratio
+        ratio = self.devicePixelRatioF()
+        key = (base_color.rgba(), self.point_size, ratio)
+        sprite = self.point_sprites.get(key)
+        if sprite is None:
+            sprite = render_point_sprite(base_color, self.point_size * ratio)
+            self.point_sprites[key] = sprite
+        return sprite
+        
+    def draw_points(self, painter: QPainter, batch: PointBatch, alpha: int = 255, scale: float = 1.0):
+        # One drawPixmapFragments call per colour
+        canvas_x, canvas_y = self.transform_point(batch.x, batch.y)
+        ratio = self.devicePixelRatioF()
+        
+        for mask, base_color in ((batch.inside, Colors.POINT_INSIDE),
+                                 (~batch.inside, Colors.POINT_OUTSIDE)):
+            count = int(np.count_nonzero(mask))
+            if count == 0:
+                continue
+                
+            draw_sprites(painter, canvas_x[mask], canvas_y[mask], self.point_sprite(base_color),
+                         scale / ratio, alpha / 255)
             
-    def draw_single_point(self, painter: QPainter, point: Point, 
-                         transform_func, alpha: int, scale: float):
-        canvas_x, canvas_y = transform_func(point.x, point.y)
-        
-        # Choose color based on whether point is inside circle
-        if point.inside_circle:
-            color = QColor(Colors.POINT_INSIDE)
-        else:
-            color = QColor(Colors.POINT_OUTSIDE)
-            
-        color.setAlpha(alpha)
-        
-        # Draw point
-        painter.setPen(Qt.NoPen)
-        painter.setBrush(QBrush(color))
-        
-        point_size = self.point_size * scale
-        painter.drawEllipse(
-            canvas_x - point_size/2, 
-            canvas_y - point_size/2,
-            point_size, 
-            point_size
-        )
-        
-    def draw_legend(self, painter: QPainter):
-        # Main educational info panel
-        panel_width = 320
-        panel_height = 120
-        panel_x = 10
-        panel_y = 10
+    def ensure_legend_layer(self):
+        if self.legend_layer is not None and self.legend_layer.devicePixelRatio() == self.devicePixelRatioF():
+            return
+        
+        # Main educational info panel, drawn in panel coordinates
+        panel_width = self.legend_rect.width()
+        panel_height = self.legend_rect.height()
+        panel_x = 0
+        panel_y = 0
+        
+        self.legend_layer = self.create_layer(panel_width, panel_height)
+        painter = QPainter(self.legend_layer)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setFont(self.font())
         
         # Draw semi-transparent background
         painter.setBrush(QBrush(QColor(0, 0, 0, 180)))
@@ -268,21 +595,68 @@ class SimulationCanvas(QWidget):
         
         painter.setPen(QPen(Colors.ERROR))
         painter.drawText(panel_x + 120, legend_y + 5, "Outside")
+        painter.end()
         
-        # Count display
-        if self.all_points:
-            inside_count = sum(1 for p in self.all_points if p.inside_circle)
-            outside_count = len(self.all_points) - inside_count
-            
+    def draw_legend(self, painter: QPainter):
+        self.ensure_legend_layer()
+        painter.drawPixmap(self.legend_rect.topLeft(), self.legend_layer)
+        
+        # The run's own totals in the density view, otherwise counts of what
+        # is drawn, labelled as a sample when they cover less than the run
+        if self.showing_density():
+            inside_count = self.density.points_inside
+            shown = self.density.total
+        else:
+            inside_count = self.display_points.points_inside
+            shown = len(self.display_points)
+        label = "In"
+        if self.run_totals is not None and self.run_totals[1] > shown:
+            if self.showing_density():
+                inside_count, shown = self.run_totals
+            else:
+                label = "Sample in"
+        outside_count = shown - inside_count
+        if shown > 0:
             painter.setPen(QPen(Colors.TEXT_HIGHLIGHT))
-            count_font = painter.font()
+            count_font = self.font()
             count_font.setPointSize(11)
             count_font.setBold(True)
             painter.setFont(count_font)
-            painter.drawText(panel_x + 200, legend_y + 5, 
-                           f"In: {inside_count} | Out: {outside_count}")
+            painter.drawText(self.legend_rect.x() + 200, self.legend_rect.y() + 100, 
+                           f"{label}: {inside_count} | Out: {outside_count}")
         
     def mousePressEvent(self, event):
         # Toggle grid on right click
         if event.button() == Qt.RightButton:
-            self.set_grid_enabled(not self.show_grid)
\ No newline at end of file
+            self.set_grid_enabled(not self.show_grid)
+        elif event.button() == Qt.LeftButton and self.is_zoomed():
+            self.drag_start = (event.position(), self.view)
+            self.setCursor(Qt.ClosedHandCursor)
+            
+    def mouseMoveEvent(self, event):
+        # Drag to pan the zoomed view
+        if self.drag_start is None:
+            return
+        origin, (x0, y0, x1, y1) = self.drag_start
+        delta = event.position() - origin
+        scale = (x1 - x0) / max(1, self.viewport()[2])
+        self.set_view((x0 + x1) / 2 - delta.x() * scale, (y0 + y1) / 2 + delta.y() * scale, x1 - x0)
+        
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton and self.drag_start is not None:
+            self.drag_start = None
+            self.unsetCursor()
+            
+    def mouseDoubleClickEvent(self, event):
+        # Double click returns to the whole square
+        if event.button() == Qt.LeftButton:
+            self.reset_view()
+            
+    def wheelEvent(self, event):
+        # Each wheel notch zooms by 1.25x around the cursor
+        steps = event.angleDelta().y() / 120
+        if steps == 0:
+            return
+        position = event.position()
+        self.zoom_at(0.8 ** steps, position.x(), position.y())
+        event.accept()
\ No newline at end of file
@@ -1,12 +1,32 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QTabWidget, QGroupBox, QTextEdit, QSplitter, QFrame)
-from PySide6.QtCore import Qt, QTimer
+                             QTabWidget, QGroupBox, QTextEdit, QSplitter, QFrame,
+                             QDoubleSpinBox, QPushButton)
+from PySide6.QtCore import Qt, QTimer, QThread, Signal
 from PySide6.QtGui import QFont
 import pyqtgraph as pg
 import numpy as np
-from typing import List
-from ...core.monte_carlo import MonteCarloSimulator, SimulationResult
+import math
+import time
+from contextlib import nullcontext
+from typing import Callable, Optional
+from ...core.monte_carlo import (MonteCarloSimulator, SimulationResult, compare_samplers,
+                                  DISTANCE_BINS, DISTANCE_RANGE)
+from ...core.history import History
+from ...core import precision
 from ...utils.colors import Colors, Styles
+from ...utils.memory import MemoryReport, format_bytes
+from ...utils.tracing import traced
+
+
+class SamplerComparisonThread(QThread):
+    comparison_ready = Signal(list)
+    
+    def __init__(self, target_error: float):
+        super().__init__()
+        self.target_error = target_error
+        
+    def run(self):
+        self.comparison_ready.emit(compare_samplers(self.target_error))
 
 
 class StatisticsPanel(QWidget):
@@ -16,8 +36,29 @@ class StatisticsPanel(QWidget):
         self.convergence_data_y = []
         self.error_data_y = []
         self.max_points_to_display = 1000
+        # Plots the user zoomed into stop following the run and show their
+        # span at a finer decimation level until auto-range is restored
+        self.zoomed_plots = set()
+        self.convergence_source = None
+        
+        # update_statistics only records the latest result; refreshes are
+        # coalesced to refresh_rate and only redraw what is visible. Tabs
+        # that miss a refresh are marked dirty and redrawn when shown.
+        self.refresh_rate = 10.0  # Hz
+        self.confidence = 0.95
+        self.target_half_width = None
+        self.simulator_lock: Callable = nullcontext
+        self.memory_source: Optional[Callable[[], MemoryReport]] = None
+        self.latest_result = None
+        self.latest_simulator = None
+        self.dirty_tabs = set()
+        self.last_refresh = 0.0
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.timeout.connect(self.refresh_visible)
         
         self.setup_ui()
+        self.tab_widget.currentChanged.connect(lambda index: self.refresh_visible())
         
     def setup_ui(self):
         self.setMinimumWidth(350)
@@ -140,6 +181,49 @@ class StatisticsPanel(QWidget):
         
         layout.addWidget(self.error_plot)
         
+        self.history_plots = {
+            self.convergence_plot: (self.convergence_curve, 'pi_estimates'),
+            self.error_plot: (self.error_curve, 'errors'),
+        }
+        for plot in self.history_plots:
+            view_box = plot.getViewBox()
+            view_box.sigRangeChangedManually.connect(lambda *args, plot=plot: self.set_plot_zoomed(plot, True))
+            view_box.sigXRangeChanged.connect(lambda *args, plot=plot: self.refresh_zoomed_plot(plot))
+            plot.getPlotItem().autoBtn.clicked.connect(lambda *args, plot=plot: self.set_plot_zoomed(plot, False))
+        
+        # Sampler comparison
+        comparison_group = QGroupBox("Sampler Comparison")
+        comparison_group.setStyleSheet("QGroupBox { color: white; font-weight: bold; }")
+        comparison_layout = QVBoxLayout(comparison_group)
+        
+        controls_layout = QHBoxLayout()
+        target_label = QLabel("Target RMSE:")
+        target_label.setStyleSheet("color: white;")
+        self.target_error_spin = QDoubleSpinBox()
+        self.target_error_spin.setDecimals(5)
+        self.target_error_spin.setRange(0.0001, 0.1)
+        self.target_error_spin.setSingleStep(0.0005)
+        self.target_error_spin.setValue(0.001)
+        self.target_error_spin.setStyleSheet("color: white; background-color: #3a3a3f;")
+        self.compare_button = QPushButton("Compare")
+        self.compare_button.setStyleSheet(Styles.BUTTON_STYLE)
+        self.compare_button.setToolTip("Measure points and time each sampler needs to reach the target error")
+        self.compare_button.clicked.connect(self.start_sampler_comparison)
+        
+        controls_layout.addWidget(target_label)
+        controls_layout.addWidget(self.target_error_spin)
+        controls_layout.addStretch()
+        controls_layout.addWidget(self.compare_button)
+        comparison_layout.addLayout(controls_layout)
+        
+        self.comparison_label = QLabel("Run a comparison to rank the sampling strategies")
+        self.comparison_label.setStyleSheet("color: white; font-family: monospace;")
+        comparison_layout.addWidget(self.comparison_label)
+        
+        layout.addWidget(comparison_group)
+        self.comparison_thread = None
+        
+        self.convergence_tab = tab
         self.tab_widget.addTab(tab, "Convergence")
         
     def create_statistics_tab(self):
@@ -253,6 +337,7 @@ class StatisticsPanel(QWidget):
         historical_layout.addWidget(self.historical_stats_text)
         layout.addWidget(historical_card, 1)  # Give it stretch factor of 1 to expand
         
+        self.statistics_tab = tab
         self.tab_widget.addTab(tab, "Statistics")
         
     def create_distribution_tab(self):
@@ -286,6 +371,26 @@ class StatisticsPanel(QWidget):
         dist_left_axis.setLabel('Number of points', color='white', size='12pt')
         dist_bottom_axis.setLabel('Distance from circle center', color='white', size='12pt')
         
+        # The bars, radius line and label are created once; updates only
+        # change bar heights and the label position
+        bin_edges = np.linspace(0.0, DISTANCE_RANGE, DISTANCE_BINS + 1)
+        width = bin_edges[1] - bin_edges[0]
+        centers = bin_edges[:-1] + width / 2
+        # Green for inside circle, red for outside
+        brushes = [pg.mkBrush('#4CAF50' if center <= 1.0 else '#F44336') for center in centers]
+        self.distribution_bars = pg.BarGraphItem(x=centers, height=np.zeros(DISTANCE_BINS), width=width * 0.8,
+                                                 brushes=brushes, pen=pg.mkPen('white'))
+        self.distribution_plot.addItem(self.distribution_bars)
+        
+        # Vertical line at radius = 1
+        self.circle_line = pg.InfiniteLine(pos=1.0, angle=90, pen=pg.mkPen('#FFD700', width=3, style=Qt.DashLine))
+        self.distribution_plot.addItem(self.circle_line)
+        
+        # Label for circle radius, kept near the top of the chart
+        self.radius_text = pg.TextItem('← Circle radius (r=1)', color='#FFD700', anchor=(0, 1))
+        self.distribution_plot.addItem(self.radius_text)
+        self.set_distribution_visible(False)
+        
         layout.addWidget(self.distribution_plot)
         
         # Efficiency metrics
@@ -297,7 +402,10 @@ class StatisticsPanel(QWidget):
         efficiency_info = [
             ("points_per_second", "Points per second:", "0"),
             ("avg_batch_time", "Avg. batch time:", "0.000 ms"),
-            ("memory_usage", "Memory usage:", "~0 MB")
+            ("batch_size", "Batch size:", "0"),
+            ("frame_budget", "Compute + paint + stats:", "off"),
+            ("memory_usage", "Memory (tracked / RSS):", "0 B"),
+            ("memory_breakdown", "Memory by subsystem:", "-")
         ]
         
         for key, label_text, default_value in efficiency_info:
@@ -319,51 +427,130 @@ class StatisticsPanel(QWidget):
             
         layout.addWidget(efficiency_group)
         
+        self.distribution_tab = tab
         self.tab_widget.addTab(tab, "Distribution")
         
-    def update_statistics(self, result: SimulationResult, simulator: MonteCarloSimulator):
-        # Update convergence plots
-        self.update_convergence_plots(simulator)
-        
-        # Update current statistics
-        self.update_current_statistics(result, simulator)
-        
-        # Update distribution plot
-        self.update_distribution_plot(simulator)
-        
-        # Update efficiency metrics
-        self.update_efficiency_metrics(result, simulator)
+    def start_sampler_comparison(self):
+        if self.comparison_thread is not None and self.comparison_thread.isRunning():
+            return
+        self.compare_button.setEnabled(False)
+        self.comparison_label.setText("Comparing samplers...")
+        self.comparison_thread = SamplerComparisonThread(self.target_error_spin.value())
+        self.comparison_thread.comparison_ready.connect(self.show_sampler_comparison)
+        self.comparison_thread.start()
+        
+    def show_sampler_comparison(self, comparisons: list):
+        self.compare_button.setEnabled(True)
+        reached = [c for c in comparisons if c.points_needed is not None]
+        fewest = min(reached, key=lambda c: c.points_needed).sampler if reached else None
+        fastest = min(reached, key=lambda c: c.wall_time).sampler if reached else None
+        
+        lines = [f"{'Sampler':<16}{'Points':>10}{'Time':>11}"]
+        for c in comparisons:
+            points = f"{c.points_needed:,}" if c.points_needed is not None else "not reached"
+            wall_time = f"{c.wall_time * 1000:.2f} ms" if c.points_needed is not None else "-"
+            marks = ("  ◀ fewest" if c.sampler == fewest else "") + ("  ◀ fastest" if c.sampler == fastest else "")
+            lines.append(f"{c.sampler:<16}{points:>10}{wall_time:>11}{marks}")
+        self.comparison_label.setText("\n".join(lines))
+        
+    def set_simulator_lock(self, lock: Callable):
+        # lock() returns a context manager held while a refresh reads the simulator
+        self.simulator_lock = lock
+        
+    def set_memory_source(self, source: Optional[Callable[[], MemoryReport]]):
+        # source() returns a MemoryReport covering more than the simulator
+        self.memory_source = source
+        
+    def set_refresh_rate(self, rate: float):
+        self.refresh_rate = max(0.1, rate)
         
+    def update_statistics(self, result: SimulationResult, simulator: MonteCarloSimulator):
+        self.latest_result = result
+        self.latest_simulator = simulator
+        self.dirty_tabs.update((self.convergence_tab, self.statistics_tab, self.distribution_tab))
+        
+        wait = self.last_refresh + 1.0 / self.refresh_rate - time.perf_counter()
+        if wait <= 0:
+            self.refresh_visible()
+        elif not self.refresh_timer.isActive():
+            # Trailing refresh, so the last result is shown after a pause
+            self.refresh_timer.start(math.ceil(wait * 1000))
+            
+    @traced(category='statistics')
+    def refresh_visible(self):
+        # Redraws the current tab if it is dirty; everything else waits
+        if self.latest_simulator is None or not self.isVisible():
+            return
+        tab = self.tab_widget.currentWidget()
+        if tab not in self.dirty_tabs:
+            return
+        self.dirty_tabs.discard(tab)
+        self.last_refresh = time.perf_counter()
+        
+        result, simulator = self.latest_result, self.latest_simulator
+        with self.simulator_lock():
+            if tab is self.convergence_tab:
+                self.update_convergence_plots(simulator)
+            elif tab is self.statistics_tab:
+                self.update_current_statistics(result, simulator)
+            elif tab is self.distribution_tab:
+                self.update_distribution_plot(simulator)
+                self.update_efficiency_metrics(result, simulator)
+                
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_visible()
+        
+    def set_plot_zoomed(self, plot: pg.PlotWidget, zoomed: bool):
+        if zoomed:
+            self.zoomed_plots.add(plot)
+        else:
+            self.zoomed_plots.discard(plot)
+        self.refresh_zoomed_plot(plot)
+        
+    def refresh_zoomed_plot(self, plot: pg.PlotWidget):
+        # Re-decimates the visible span right away, e.g. while paused
+        if plot in self.zoomed_plots and self.convergence_source is not None:
+            curve, name = self.history_plots[plot]
+            with self.simulator_lock():
+                self.plot_history(plot, curve, getattr(self.convergence_source, name))
+        
+    def plot_history(self, plot: pg.PlotWidget, curve, history: History):
+        # A fixed-size min/max series of the whole run, or of the zoomed span
+        if plot in self.zoomed_plots:
+            x_min, x_max = plot.getViewBox().viewRange()[0]
+            x_data, y_data = history.decimate(self.max_points_to_display,
+                                              math.floor(x_min), math.ceil(x_max) + 1)
+        else:
+            x_data, y_data = history.decimate(self.max_points_to_display)
+        curve.setData(x_data, y_data)
+        return x_data, y_data
+        
+    @traced(category='statistics')
     def update_convergence_plots(self, simulator: MonteCarloSimulator):
-        x_data, pi_data, error_data = simulator.get_convergence_data()
-        
-        if not x_data or not pi_data or not error_data:
+        self.convergence_source = simulator
+        history_length = len(simulator.pi_estimates)
+        if history_length == 0:
             return
             
-        if len(x_data) > self.max_points_to_display:
-            # Subsample data for performance
-            step = len(x_data) // self.max_points_to_display
-            x_data = x_data[::step]
-            pi_data = pi_data[::step]
-            error_data = error_data[::step]
-            
         # Update convergence plot
-        self.convergence_curve.setData(x_data, pi_data)
+        x_data, pi_data = self.plot_history(self.convergence_plot, self.convergence_curve,
+                                            simulator.pi_estimates)
         
         # Auto-scale convergence plot
-        if len(pi_data) > 0:
-            y_min = min(min(pi_data), 2.8)
-            y_max = max(max(pi_data), 3.4)
+        if len(pi_data) > 0 and self.convergence_plot not in self.zoomed_plots:
+            y_min = min(float(pi_data.min()), 2.8)
+            y_max = max(float(pi_data.max()), 3.4)
             self.convergence_plot.setYRange(y_min - 0.1, y_max + 0.1)
-            self.convergence_plot.setXRange(0, max(x_data) + 1)
+            self.convergence_plot.setXRange(0, history_length)
         
         # Update error plot
-        self.error_curve.setData(x_data, error_data)
+        x_data, error_data = self.plot_history(self.error_plot, self.error_curve, simulator.errors)
         
         # Auto-scale error plot
-        if len(error_data) > 0:
-            y_max = max(error_data)
-            y_min = min(error_data)
+        if len(error_data) > 0 and self.error_plot not in self.zoomed_plots:
+            y_max = float(error_data.max())
+            y_min = float(error_data.min())
             
             # Always use linear scale and start from 0
             self.error_plot.setLogMode(y=False)
@@ -382,8 +569,9 @@ class StatisticsPanel(QWidget):
                 # Large errors
                 self.error_plot.setYRange(0, y_max * 1.2)
                 
-            self.error_plot.setXRange(0, max(x_data) + 1)
+            self.error_plot.setXRange(0, history_length)
         
+    @traced(category='statistics')
     def update_current_statistics(self, result: SimulationResult, simulator: MonteCarloSimulator):
         stats = simulator.get_statistics()
         
@@ -395,15 +583,47 @@ class StatisticsPanel(QWidget):
         self.stats_labels["relative_error"].setText(f"{(result.error / np.pi * 100):.2f}%")
         
         # Update historical statistics text
-        self.update_historical_text(stats, result)
-        
-    def update_historical_text(self, stats: dict, result: SimulationResult):
+        self.update_historical_text(stats, result, self.format_precision(simulator))
+        
+    def set_target_precision(self, half_width: Optional[float]):
+        self.target_half_width = half_width
+        self.dirty_tabs.add(self.statistics_tab)
+        self.refresh_visible()
+        
+    def format_precision(self, simulator: MonteCarloSimulator) -> str:
+        if simulator.total_points == 0:
+            return ""
+        low, high = simulator.get_confidence_interval(self.confidence)
+        half_width = (high - low) / 2
+        text = f"""
+
+📏 Precision ({self.confidence:.0%} CI):
+   • Interval: [{low:.6f}, {high:.6f}]
+   • Half-width: ±{half_width:.6f} (SE {simulator.get_standard_error():.6f})"""
+        # With all points inside (or outside) so far the interval is degenerate
+        points_outside = simulator.total_points - simulator.points_inside
+        if half_width <= 0 or min(simulator.points_inside, points_outside) < precision.MIN_OUTCOME_COUNT:
+            return text
+            
+        # Plan for the requested precision, or the next decade below the current one
+        target = self.target_half_width or 10.0 ** math.floor(math.log10(half_width))
+        plan = simulator.plan_precision(target, self.confidence)
+        if plan.points_remaining == 0:
+            outlook = "reached"
+        elif plan.seconds_remaining is None:
+            outlook = f"{plan.points_remaining:,} more points"
+        else:
+            outlook = f"{plan.points_remaining:,} more points (~{plan.seconds_remaining:.1f}s of sampling)"
+        return text + f"""
+   • For ±{target:g}: {outlook}"""
+        
+    def update_historical_text(self, stats: dict, result: SimulationResult, precision_text: str = ""):
         historical_text = f"""📊 SIMULATION STATISTICS
 
 🎯 π Estimation:
    • Average: {stats['mean_estimate']:.6f}
    • Std deviation: {stats['std_estimate']:.6f}
-   • Current: {result.pi_estimate:.6f}
+   • Current: {result.pi_estimate:.6f}{self.format_recent_statistics(stats)}{precision_text}
 
 ⚠️  Error Analysis:
    • Minimum: {stats['min_error']:.6f}
@@ -423,84 +643,81 @@ class StatisticsPanel(QWidget):
         
         self.historical_stats_text.setPlainText(historical_text)
         
-    def update_distribution_plot(self, simulator: MonteCarloSimulator):
-        points = simulator.get_all_points()
+    def format_recent_statistics(self, stats: dict) -> str:
+        if 'recent_mean_estimate' not in stats:
+            return ""
+        return (f"\n   • Recent average: {stats['recent_mean_estimate']:.6f}"
+                f"\n   • Recent std deviation: {stats['recent_std_estimate']:.6f}")
         
-        if len(points) > 1000:  # Limit for performance
-            points = points[-1000:]
-            
-        if not points:
-            # If no points, clear the plot and show empty state
-            self.distribution_plot.clear()
+    def set_distribution_visible(self, visible: bool):
+        for item in (self.distribution_bars, self.circle_line, self.radius_text):
+            item.setVisible(visible)
+        
+    @traced(category='statistics')
+    def update_distribution_plot(self, simulator: MonteCarloSimulator):
+        # Counts cover every sample and are kept up to date by the simulator
+        _, hist = simulator.get_distance_histogram()
+        max_height = int(hist.max())
+        if max_height == 0:
+            self.set_distribution_visible(False)
             return
             
-        try:
-            distances = [np.sqrt(p.x**2 + p.y**2) for p in points]
-            
-            # Create histogram
-            hist, bin_edges = np.histogram(distances, bins=20, range=(0, 1.5))
-            
-            # Clear previous plot
-            self.distribution_plot.clear()
-            
-            # Only plot if we have data
-            if len(hist) > 0 and np.sum(hist) > 0:
-                # Plot histogram as bars
-                width = bin_edges[1] - bin_edges[0]
-                x = bin_edges[:-1] + width/2
-                
-                # Color bars based on whether they're inside or outside circle
-                colors = []
-                for center in x:
-                    if center <= 1.0:
-                        colors.append('#4CAF50')  # Green for inside circle
-                    else:
-                        colors.append('#F44336')  # Red for outside circle
-                
-                # Create bars with different colors
-                for i, (xi, hi) in enumerate(zip(x, hist)):
-                    if hi > 0:  # Only draw if there's data
-                        bar = pg.BarGraphItem(x=[xi], height=[hi], width=width*0.8, 
-                                            brush=pg.mkBrush(colors[i]), pen=pg.mkPen('white'))
-                        self.distribution_plot.addItem(bar)
-                
-                # Add vertical line at radius = 1
-                circle_line = pg.InfiniteLine(pos=1.0, angle=90, pen=pg.mkPen('#FFD700', width=3, style=Qt.DashLine))
-                self.distribution_plot.addItem(circle_line)
-                
-                # Add text label for circle radius - positioned at top of chart
-                max_height = max(hist) if len(hist) > 0 and max(hist) > 0 else 100
-                radius_text = pg.TextItem('← Circle radius (r=1)', color='#FFD700', anchor=(0, 1))
-                radius_text.setPos(1.02, max_height * 0.9)  # Position near top
-                self.distribution_plot.addItem(radius_text)
-                
-                # Update axis range
-                if max_height > 0:
-                    self.distribution_plot.setYRange(0, max_height * 1.1)
-                    
-        except Exception as e:
-            print(f"Error updating distribution plot: {e}")
-            self.distribution_plot.clear()
+        self.distribution_bars.setOpts(height=hist)
+        self.radius_text.setPos(1.02, max_height * 0.9)  # Position near top
+        self.set_distribution_visible(True)
+        self.distribution_plot.setYRange(0, max_height * 1.1)
         
+    @traced(category='statistics')
     def update_efficiency_metrics(self, result: SimulationResult, simulator: MonteCarloSimulator):
         # Points per second (rough estimate)
         if result.computation_time > 0:
-            pps = len(result.points) / result.computation_time
+            pps = result.batch_size / result.computation_time
             self.efficiency_labels["points_per_second"].setText(f"{pps:.0f}")
             
         # Average batch time
         avg_time_ms = result.computation_time * 1000
         self.efficiency_labels["avg_batch_time"].setText(f"{avg_time_ms:.3f} ms")
         
-        # Rough memory usage estimate
-        estimated_memory = len(simulator.get_all_points()) * 32 / (1024 * 1024)  # rough estimate
-        self.efficiency_labels["memory_usage"].setText(f"~{estimated_memory:.1f} MB")
+        self.efficiency_labels["batch_size"].setText(f"{result.batch_size:,}")
+        
+        self.update_memory_usage(simulator)
+        
+    def update_memory_usage(self, simulator: MonteCarloSimulator):
+        if self.memory_source is not None:
+            report = self.memory_source()
+        else:
+            report = MemoryReport()
+            report.add("simulator", simulator.memory_usage())
+            
+        rss = format_bytes(report.rss) if report.rss is not None else "n/a"
+        self.efficiency_labels["memory_usage"].setText(f"{format_bytes(report.total)} / {rss}")
+        self.efficiency_labels["memory_breakdown"].setText(
+            " · ".join(f"{name} {format_bytes(size)}" for name, size in report.subtotals().items()))
+        self.efficiency_labels["memory_breakdown"].setToolTip(
+            "\n".join(f"{name}: {format_bytes(size)}" for name, size in report.components.items()))
+        
+    def update_frame_budget(self, breakdown: Optional[dict]):
+        # breakdown comes from FrameBudgetController; None when batching is fixed
+        if breakdown is None:
+            self.efficiency_labels["frame_budget"].setText("off")
+            return
+        self.efficiency_labels["frame_budget"].setText(
+            f"{breakdown['compute_ms']:.1f} + {breakdown['paint_ms']:.1f} + "
+            f"{breakdown['stats_ms']:.1f} / {breakdown['budget_ms']:.0f} ms"
+        )
         
     def clear(self):
         # Clear plots
+        self.refresh_timer.stop()
+        self.latest_result = None
+        self.latest_simulator = None
+        self.dirty_tabs.clear()
+        self.convergence_source = None
+        self.zoomed_plots.clear()
         self.convergence_curve.clear()
         self.error_curve.clear()
-        self.distribution_plot.clear()
+        self.distribution_bars.setOpts(height=np.zeros(DISTANCE_BINS))
+        self.set_distribution_visible(False)
         
         # Reset labels safely
         for key, label in self.stats_labels.items():
@@ -512,5 +729,6 @@ class StatisticsPanel(QWidget):
         for label in self.efficiency_labels.values():
             if label:  # Safety check
                 label.setText("0")
+        self.efficiency_labels["frame_budget"].setText("off")
             
         self.historical_stats_text.clear()
\ No newline at end of file
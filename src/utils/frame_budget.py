@@ -0,0 +1,62 @@
+class FrameBudgetController:
+    # Sizes simulation batches so that one frame - sampling plus the paint
+    # and statistics work it causes - fits a time budget. Compute cost is
+    # tracked per point, so target = time left / cost per point; iterating
+    # this also absorbs any fixed per-call overhead. All times are smoothed
+    # with an EWMA and the batch changes by at most max_step per update.
+    def __init__(self, budget_ms: float = 16.0, batch_size: int = 42,
+                 min_batch_size: int = 1, max_batch_size: int = 1 << 20,
+                 smoothing: float = 0.3, max_step: float = 2.0):
+        self.budget_ms = budget_ms
+        self.initial_batch_size = batch_size
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.smoothing = smoothing
+        self.max_step = max_step
+        self.reset()
+
+    def reset(self):
+        self.batch_size = self.initial_batch_size
+        self.compute_time = 0.0  # seconds per step, for display
+        self.cost_per_point = None
+        self.paint_time = 0.0
+        self.stats_time = 0.0
+
+    def smooth(self, previous: float, value: float) -> float:
+        return previous + self.smoothing * (value - previous)
+
+    def set_budget(self, budget_ms: float):
+        self.budget_ms = max(1.0, budget_ms)
+
+    @property
+    def compute_budget(self) -> float:
+        # Seconds left for sampling; always at least a quarter of the frame
+        budget = self.budget_ms / 1000
+        return max(budget * 0.25, budget - self.paint_time - self.stats_time)
+
+    def record_compute(self, seconds: float, batch_size: int) -> int:
+        if batch_size <= 0:
+            return self.batch_size
+        cost = seconds / batch_size
+        self.cost_per_point = cost if self.cost_per_point is None else self.smooth(self.cost_per_point, cost)
+        self.compute_time = self.smooth(self.compute_time, seconds)
+
+        target = self.compute_budget / self.cost_per_point if self.cost_per_point > 0 else self.max_batch_size
+        target = min(max(target, self.batch_size / self.max_step), self.batch_size * self.max_step)
+        self.batch_size = int(min(max(target, self.min_batch_size), self.max_batch_size))
+        return self.batch_size
+
+    def record_paint(self, seconds: float):
+        self.paint_time = self.smooth(self.paint_time, seconds)
+
+    def record_stats(self, seconds: float):
+        self.stats_time = self.smooth(self.stats_time, seconds)
+
+    def breakdown(self) -> dict:
+        return {
+            "budget_ms": self.budget_ms,
+            "batch_size": self.batch_size,
+            "compute_ms": self.compute_time * 1000,
+            "paint_ms": self.paint_time * 1000,
+            "stats_ms": self.stats_time * 1000,
+        }
@@ -0,0 +1,55 @@
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+try:
+    import psutil
+except ImportError:  # optional; /proc is read directly on Linux
+    psutil = None
+
+
+def process_rss() -> Optional[int]:
+    # Resident set size in bytes, or None where it cannot be read
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as statm:
+            resident_pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE')
+
+
+def format_bytes(size: float) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+@dataclass
+class MemoryReport:
+    # Bytes held by each subsystem's buffers ("simulator.store",
+    # "canvas.layers", ...) next to the resident size of the whole process;
+    # the difference is the interpreter, Qt and everything not accounted for
+    components: Dict[str, int] = field(default_factory=dict)
+    rss: Optional[int] = None
+
+    def add(self, prefix: str, components: Dict[str, int]):
+        for name, size in components.items():
+            self.components[f"{prefix}.{name}"] = int(size)
+
+    @property
+    def total(self) -> int:
+        return sum(self.components.values())
+
+    def subtotals(self) -> Dict[str, int]:
+        # Components summed per subsystem, i.e. per prefix
+        totals: Dict[str, int] = {}
+        for name, size in self.components.items():
+            subsystem = name.split('.', 1)[0]
+            totals[subsystem] = totals.get(subsystem, 0) + size
+        return totals
+
+    def to_dict(self) -> dict:
+        return {"components": dict(self.components), "total": self.total, "rss": self.rss}
@@ -0,0 +1,62 @@
+import struct
+import zlib
+import numpy as np
+
+
+class PNGWriter:
+    # Streams an 8-bit RGB PNG row block by row block, so images far larger
+    # than memory can be written. Rows use the Up filter, which suits the
+    # mostly flat backgrounds of exported plots.
+    def __init__(self, path, width: int, height: int, compression: int = 6):
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self._previous = np.zeros((1, width * 3), dtype=np.uint8)
+        self._compressor = zlib.compressobj(compression)
+        self._file = open(path, 'wb')
+        self._file.write(b'\x89PNG\r\n\x1a\n')
+        # bit depth 8, colour type 2 (RGB), default compression/filter, no interlace
+        self._write_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+
+    def _write_chunk(self, kind: bytes, data: bytes):
+        self._file.write(struct.pack('>I', len(data)))
+        self._file.write(kind)
+        self._file.write(data)
+        self._file.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(kind)) & 0xffffffff))
+
+    def write_rows(self, rgb: np.ndarray):
+        # rgb: (rows, width, 3) uint8
+        rows = np.ascontiguousarray(rgb, dtype=np.uint8).reshape(len(rgb), self.width * 3)
+        if self.rows_written + len(rows) > self.height:
+            raise ValueError(f"PNG has {self.height} rows, got {self.rows_written + len(rows)}")
+
+        above = np.concatenate([self._previous, rows[:-1]])
+        filtered = np.empty((len(rows), self.width * 3 + 1), dtype=np.uint8)
+        filtered[:, 0] = 2  # Up filter
+        np.subtract(rows, above, out=filtered[:, 1:])
+
+        data = self._compressor.compress(filtered.tobytes())
+        if data:
+            self._write_chunk(b'IDAT', data)
+        self._previous = rows[-1:].copy()
+        self.rows_written += len(rows)
+
+    def close(self):
+        if self._file.closed:
+            return
+        try:
+            if self.rows_written != self.height:
+                raise ValueError(f"PNG expects {self.height} rows, only {self.rows_written} written")
+            self._write_chunk(b'IDAT', self._compressor.flush())
+            self._write_chunk(b'IEND', b'')
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
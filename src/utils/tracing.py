@@ -0,0 +1,129 @@
+import atexit
+import functools
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Callable, List, Optional, Tuple
+
+
+# MONTECARLO_TRACE=1 records from startup; any other value except 0 is a
+# path the trace is written to when the process exits
+TRACE_ENVIRONMENT_VARIABLE = 'MONTECARLO_TRACE'
+
+# (name, category, start ns, duration ns, thread id)
+Span = Tuple[str, str, int, int, int]
+
+
+class Tracer:
+    # Completed spans in a bounded ring buffer; the oldest are dropped once
+    # it is full, so recording can stay on for a whole run. Disabled, a
+    # traced call costs one attribute check.
+    def __init__(self, capacity: int = 100_000):
+        self.enabled = False
+        self.capacity = capacity
+        self._spans = deque(maxlen=capacity)
+        self._thread_names = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def name_thread(self, name: str):
+        # For threads started outside the threading module (e.g. QThread),
+        # which it would otherwise list as Dummy-N
+        with self._lock:
+            self._thread_names[threading.get_ident()] = name
+
+    def record(self, name: str, category: str, start: int, end: int):
+        thread_id = threading.get_ident()
+        with self._lock:
+            if thread_id not in self._thread_names:
+                self._thread_names[thread_id] = threading.current_thread().name
+            self._spans.append((name, category, start, end - start, thread_id))
+
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def to_chrome_trace(self) -> dict:
+        # Trace Event Format, as read by chrome://tracing and Perfetto
+        process_id = os.getpid()
+        with self._lock:
+            spans = list(self._spans)
+            thread_names = dict(self._thread_names)
+        events = [{"name": "thread_name", "ph": "M", "pid": process_id, "tid": thread_id,
+                   "args": {"name": thread_name}}
+                  for thread_id, thread_name in thread_names.items()]
+        events.extend({"name": name, "cat": category, "ph": "X", "pid": process_id, "tid": thread_id,
+                       "ts": start / 1000, "dur": duration / 1000}
+                      for name, category, start, duration, thread_id in spans)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str):
+        with open(path, 'w') as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file)
+
+
+tracer = Tracer()
+
+
+def traced(name: Optional[str] = None, category: str = 'app') -> Callable:
+    # Decorator recording each call as a span named after the function
+    def decorate(function: Callable) -> Callable:
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                tracer.record(span_name, category, start, time.perf_counter_ns())
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def _span(name: str, category: str):
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        tracer.record(name, category, start, time.perf_counter_ns())
+
+
+def span(name: str, category: str = 'app'):
+    # `with span(...)` around a block; a shared no-op context while disabled
+    if not tracer.enabled:
+        return nullcontext()
+    return _span(name, category)
+
+
+def configure_from_environment():
+    # Pool workers inherit the variable; only the main process records and
+    # writes the file, so they cannot overwrite its trace
+    value = os.environ.get(TRACE_ENVIRONMENT_VARIABLE, '')
+    if value in ('', '0') or multiprocessing.parent_process() is not None:
+        return
+    tracer.enable()
+    if value != '1':
+        atexit.register(tracer.export, value)
+
+
+configure_from_environment()